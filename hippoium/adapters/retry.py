@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 import logging
 import random
 import time
@@ -17,10 +18,23 @@ class RetryConfig:
     jitter: float = 0.1
 
 
+@lru_cache(maxsize=32)
+def _backoff_table(config: RetryConfig) -> tuple[float, ...]:
+    """Capped exponential delays before attempts 2..max_attempts."""
+    delays: list[float] = []
+    delay = config.base_delay
+    for _ in range(max(config.max_attempts - 1, 0)):
+        delays.append(min(config.max_delay, delay))
+        # doubling is exact in binary floating point; stop once capped
+        if delay < config.max_delay:
+            delay *= 2
+    return tuple(delays)
+
+
 def _compute_delay(attempt: int, config: RetryConfig) -> float:
-    delay = min(config.max_delay, config.base_delay * (2 ** (attempt - 1)))
+    delay = _backoff_table(config)[attempt - 1]
     if config.jitter:
-        delay += random.uniform(0, config.jitter)
+        delay += random.random() * config.jitter
     return delay
 
 
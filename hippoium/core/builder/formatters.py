@@ -3,6 +3,7 @@ from __future__ import annotations
 import json
 import re
 from collections.abc import Iterable, Sequence
+from functools import lru_cache
 
 from hippoium.ports.domain import MemoryItem, ToolSpec
 
@@ -17,12 +18,23 @@ def prefix_lines(text: str, prefix: str = DATA_PREFIX) -> str:
 
 
 def format_data_section(label: str, lines: Iterable[str]) -> str:
-    content = "\n".join(prefix_lines(line) for line in lines if line is not None)
-    if not content.strip():
+    # Prefix every physical line into one buffer and join once, rather than
+    # joining per input line and then joining the joined blocks again.
+    buf: list[str] = []
+    for line in lines:
+        if line is None:
+            continue
+        buf.extend(f"{DATA_PREFIX}{part}" for part in line.splitlines() or [""])
+    content = "\n".join(buf)
+    if not content or content.isspace():
         return ""
     return f"{label} {DATA_HEADER_SUFFIX}:\n{content}"
 
 
+# Runs of unsafe characters collapse to a single "_", which a per-character
+# str.translate table cannot express; the same few tool names are rendered on
+# every build, so memoize the regex pass instead.
+@lru_cache(maxsize=1024)
 def sanitize_tool_name(name: str) -> str:
     if not name:
         return "unnamed_tool"
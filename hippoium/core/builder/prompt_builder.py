@@ -147,7 +147,7 @@ class PromptBuilder:
         if "user_query" in slots:
             fill_vals["user_query"] = format_user_query(user_query)
 
-        prompt_text = template.content.format(**fill_vals)
+        prompt_text = self.registry.render(template_id, fill_vals) or ""
         lines = [line.strip() for line in prompt_text.splitlines() if line.strip()]
 
         # strict role parsing (trusted template only)
@@ -179,6 +179,20 @@ class PromptBuilder:
         if token_budget is None:
             return messages, trimmed
 
+        if context and self._count_message_tokens(messages) > token_budget:
+            messages = self._trim_context(
+                template_id,
+                messages,
+                context,
+                user_query,
+                negative_examples,
+                tools,
+                token_budget,
+                trimmed,
+            )
+            if not messages:
+                return messages, trimmed
+
         while self._count_message_tokens(messages) > token_budget:
             if context:
                 context.pop(0)
@@ -202,18 +216,68 @@ class PromptBuilder:
                 break
         return messages, trimmed
 
-    def _trim_fallback_messages(
+    def _trim_context(
         self,
+        template_id: str,
         messages: list[dict],
+        context: list[MemoryItem],
+        user_query: str,
+        negative_examples: list[str],
+        tools: list[ToolSpec],
         token_budget: int,
+        trimmed: dict,
     ) -> list[dict]:
-        trimmed = list(messages)
-        while trimmed and self._count_message_tokens(trimmed) > token_budget:
-            if len(trimmed) > 1:
-                trimmed.pop(0)
+        """Drop the fewest oldest context items that bring the prompt in budget.
+
+        Each item renders to its own lines, so dropping more never grows the
+        prompt: binary-search the cut (O(log n) rebuilds) instead of
+        rebuilding after every pop. Stops at the whole context if even that
+        is not enough; tools and negatives are trimmed by the caller.
+        """
+        lo, hi = 1, len(context)
+        fit: tuple[int, list[dict]] | None = None
+        while lo < hi:
+            mid = (lo + hi) // 2
+            candidate = self._build_from_template(
+                template_id,
+                context[mid:],
+                user_query,
+                negative_examples,
+                tools,
+            )
+            if not candidate or self._count_message_tokens(candidate) <= token_budget:
+                hi = mid
+                fit = (mid, candidate)
             else:
-                break
-        return trimmed
+                lo = mid + 1
+        if fit is not None and fit[0] == lo:
+            messages = fit[1]
+        else:
+            messages = self._build_from_template(
+                template_id,
+                context[lo:],
+                user_query,
+                negative_examples,
+                tools,
+            )
+        del context[:lo]
+        trimmed["context"] += lo
+        return messages
+
+    def _trim_fallback_messages(
+        self,
+        messages: list[dict],
+        token_budget: int,
+    ) -> list[dict]:
+        # Token counts are additive per message: count each once, then drop
+        # from the front while the running total is over budget (O(n)).
+        counts = [count_tokens(m.get("content", "")) for m in messages]
+        total = sum(counts)
+        start, last = 0, len(messages) - 1
+        while start < last and total > token_budget:
+            total -= counts[start]
+            start += 1
+        return messages[start:]
 
     def _count_message_tokens(self, messages: list[dict]) -> int:
         return int(count_tokens([m.get("content", "") for m in messages]))
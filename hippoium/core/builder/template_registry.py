@@ -3,7 +3,11 @@
 import os
 import yaml
 import string
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+# Compiled template: literal strings interleaved with slot names, stored as
+# (literal, None) or (None, slot) pairs so rendering is a single join.
+_TemplatePart = Tuple[Optional[str], Optional[str]]
 
 try:
     from hippoium.ports.mcp import PromptTemplate
@@ -25,6 +29,8 @@ class TemplateRegistry:
         self.template_slots: Dict[str, List[str]] = {}
         self._source_path: Optional[str] = None
         self._file_templates: set = set()  # track templates loaded from files (for reload)
+        # name -> (content the parts were compiled from, parts or None)
+        self._compiled: Dict[str, Tuple[str, Optional[List[_TemplatePart]]]] = {}
 
     def load_from_path(self, path: str) -> None:
         """
@@ -49,6 +55,7 @@ class TemplateRegistry:
             if name not in loaded_file_templates:
                 self.templates.pop(name, None)
                 self.template_slots.pop(name, None)
+                self._compiled.pop(name, None)
         # Update the set of file-loaded templates
         self._file_templates = loaded_file_templates
 
@@ -93,6 +100,7 @@ class TemplateRegistry:
             else:
                 slots = self._extract_slots_from_content(content)
             self.template_slots[name] = slots
+            self._compile(name, content)
             loaded_names.add(name)
 
     def _extract_slots_from_content(self, content: str) -> List[str]:
@@ -125,8 +133,51 @@ class TemplateRegistry:
         # Compute slots for the template content
         slots = self._extract_slots_from_content(content)
         self.template_slots[name] = slots
+        self._compile(name, content)
         # Note: dynamic templates are not added to _file_templates, so they persist through reloads
 
+    def _compile(self, name: str, content: str) -> Optional[List[_TemplatePart]]:
+        """
+        Parse the template's placeholders once. Only plain ``{name}`` fields are
+        compiled; anything with a format spec, conversion, attribute/index
+        access or a positional field leaves the parts as None so rendering
+        defers to ``str.format_map``.
+        """
+        parts: Optional[List[_TemplatePart]] = []
+        try:
+            for literal, field_name, spec, conversion in string.Formatter().parse(content):
+                if literal:
+                    parts.append((literal, None))
+                if field_name is None:
+                    continue
+                if spec or conversion or not field_name.isidentifier():
+                    parts = None
+                    break
+                parts.append((None, field_name))
+        except (ValueError, TypeError):
+            parts = None
+        self._compiled[name] = (content, parts)
+        return parts
+
+    def render(self, name: str, values: Mapping[str, Any]) -> Optional[str]:
+        """
+        Fill a registered template's slots from ``values``. Equivalent to
+        ``template.content.format_map(values)``; missing slots raise KeyError.
+        Returns None if the template does not exist.
+        """
+        template = self.templates.get(name)
+        if template is None:
+            return None
+        content = template.content
+        cached = self._compiled.get(name)
+        # recompile if the stored template was replaced or edited in place
+        parts = cached[1] if cached and cached[0] is content else self._compile(name, content)
+        if parts is None:
+            return content.format_map(values)
+        return "".join(
+            literal if slot is None else format(values[slot]) for literal, slot in parts
+        )
+
     def get_template(self, name: str) -> Optional[PromptTemplate]:
         """Retrieve a template by name."""
         return self.templates.get(name)
@@ -33,35 +33,11 @@ class TierCache:
     @classmethod
     def from_config(cls, config: dict) -> "TierCache":
         """Instantiate tiered caches from a config dictionary."""
-
-        def cfg(name: str) -> dict:
-            return config.get(name, {}) if config else {}
-
-        sc_cfg = cfg("SCache")
-        if sc_cfg.get("enabled", True):
-            s_obj = SCache(capacity=sc_cfg.get("capacity"), ttl=sc_cfg.get("ttl", timedelta(minutes=30)))
-        else:
-            s_obj = _NoopCache()
-
-        mb_cfg = cfg("MBuffer")
-        if mb_cfg.get("enabled", True):
-            m_obj = MBuffer(max_messages=mb_cfg.get("max_messages"), max_tokens=mb_cfg.get("max_tokens"), ttl=mb_cfg.get("ttl", timedelta(minutes=30)))
-        else:
-            m_obj = _NoopCache()
-
-        lv_cfg = cfg("LVector")
-        if lv_cfg.get("enabled", True):
-            l_obj = LVector(capacity=lv_cfg.get("capacity"))
-        else:
-            l_obj = _NoopCache()
-
-        cs_cfg = cfg("ColdStore")
-        if cs_cfg.get("enabled", True):
-            cold_obj = ColdStore(capacity=cs_cfg.get("capacity"))
-        else:
-            cold_obj = _NoopCache()
-
-        return cls(s_obj, m_obj, l_obj, cold_obj)
+        stores = []
+        for name, build in _TIER_BUILDERS:
+            tier_cfg = config.get(name, {}) if config else {}
+            stores.append(build(tier_cfg) if tier_cfg.get("enabled", True) else _NoopCache())
+        return cls(*stores)
 
 
 class _NoopCache(CacheProtocol):
@@ -75,3 +51,21 @@ class _NoopCache(CacheProtocol):
 
     def delete(self, key: str):
         pass
+
+
+_DEFAULT_TTL = timedelta(minutes=30)
+
+# (config section, factory) in TierCache constructor order: S, M, L, COLD.
+_TIER_BUILDERS = (
+    ("SCache", lambda c: SCache(capacity=c.get("capacity"), ttl=c.get("ttl", _DEFAULT_TTL))),
+    (
+        "MBuffer",
+        lambda c: MBuffer(
+            max_messages=c.get("max_messages"),
+            max_tokens=c.get("max_tokens"),
+            ttl=c.get("ttl", _DEFAULT_TTL),
+        ),
+    ),
+    ("LVector", lambda c: LVector(capacity=c.get("capacity"))),
+    ("ColdStore", lambda c: ColdStore(capacity=c.get("capacity"))),
+)
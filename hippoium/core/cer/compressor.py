@@ -10,6 +10,19 @@ from hippoium.core.utils.hasher import hash_text
 from hippoium.core.utils.token_counter import count_tokens
 
 
+def _hunk_range(n: int) -> str:
+    return "1" if n == 1 else f"1,{n}"
+
+
+def _replace_hunk(old: List[str], new: List[str]) -> str:
+    """Unified diff of two non-empty line lists sharing no line."""
+    hunk = f"@@ -{_hunk_range(len(old))} +{_hunk_range(len(new))} @@"
+    header = ["--- ", "+++ ", hunk]
+    return "\n".join(
+        header + ["-" + line for line in old] + ["+" + line for line in new]
+    )
+
+
 class Compressor:
     def __init__(
         self,
@@ -46,11 +59,17 @@ class Compressor:
         if not chunks:
             return []
         base = chunks[0]
+        base_lines = base.splitlines()
         patches = [base]
         for c in chunks[1:]:
-            diff = difflib.unified_diff(base.splitlines(), c.splitlines(), lineterm="")
-            patches.append("\n".join(diff))
-            base = c
+            lines = c.splitlines()
+            if base_lines and lines and set(base_lines).isdisjoint(lines):
+                # unrelated neighbours: difflib would emit one full-replace hunk
+                patches.append(_replace_hunk(base_lines, lines))
+            else:
+                diff = difflib.unified_diff(base_lines, lines, lineterm="")
+                patches.append("\n".join(diff))
+            base_lines = lines
         return patches
 
     def _keep_head(self, chunks: List[str], budget: int | None = None) -> List[str]:
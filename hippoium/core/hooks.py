@@ -3,7 +3,9 @@
 import asyncio
 import inspect
 import logging
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
 
 class HookRegistry:
     """
@@ -11,8 +13,9 @@ class HookRegistry:
     for specific events and notifies them on event trigger.
     """
     def __init__(self) -> None:
-        # Mapping from event name to list of callbacks
-        self._hooks: Dict[str, List[Callable[..., Any]]] = {}
+        # Mapping from event name to callbacks. Tuples are replaced (copy-on-write)
+        # on register/unregister, so notify can iterate them without copying.
+        self._hooks: Dict[str, Tuple[Callable[..., Any], ...]] = {}
 
     def register(
         self,
@@ -27,21 +30,21 @@ class HookRegistry:
 
             return decorator
 
-        if event not in self._hooks:
-            self._hooks[event] = []
-        if callback not in self._hooks[event]:
-            self._hooks[event].append(callback)
+        callbacks = self._hooks.get(event, ())
+        if callback not in callbacks:
+            self._hooks[event] = callbacks + (callback,)
         return callback
 
     def unregister(self, event: str, callback: Callable[..., Any]) -> None:
         """Unregister a previously registered callback from an event."""
-        if event in self._hooks:
-            try:
-                self._hooks[event].remove(callback)
-            except ValueError:
-                pass  # Ignore if callback not found
-        # Clean up the event list if empty
-        if event in self._hooks and not self._hooks[event]:
+        callbacks = self._hooks.get(event)
+        if not callbacks or callback not in callbacks:
+            return  # Ignore if callback not found
+        remaining = tuple(cb for cb in callbacks if cb != callback)
+        # Clean up the event entry if empty
+        if remaining:
+            self._hooks[event] = remaining
+        else:
             del self._hooks[event]
 
     def notify(self, event: str, *args: Any, **kwargs: Any) -> None:
@@ -50,11 +53,11 @@ class HookRegistry:
         Async callbacks are executed to completion; if called outside an event loop, this method will block until all async hooks complete.
         If called from within an existing event loop, async hooks are scheduled to run concurrently.
         """
-        if event not in self._hooks:
+        callbacks = self._hooks.get(event)
+        if not callbacks:
             return
         async_tasks: List[Any] = []
-        logger = logging.getLogger(__name__)
-        for callback in list(self._hooks[event]):
+        for callback in callbacks:
             try:
                 result = callback(*args, **kwargs)
             except Exception:
@@ -84,11 +87,11 @@ class HookRegistry:
         """
         Async version of notify. Awaits all async callbacks. Use this within async functions if needed.
         """
-        if event not in self._hooks:
+        callbacks = self._hooks.get(event)
+        if not callbacks:
             return
-        logger = logging.getLogger(__name__)
         tasks: List[Any] = []
-        for callback in list(self._hooks[event]):
+        for callback in callbacks:
             if inspect.iscoroutinefunction(callback):
                 tasks.append(callback(*args, **kwargs))
             else:
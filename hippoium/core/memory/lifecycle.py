@@ -24,8 +24,10 @@ class LifecycleManager:
                         expired.append(k)
                 for k in expired:
                     if isinstance(store, MBuffer):
-                        store._token_count -= store.data[k]["len"]
-                    del store.data[k]
+                        # keeps the token counter and 2Q queues in sync
+                        store._remove(k)
+                    else:
+                        del store.data[k]
 
     def promote(self, key: str):
         """Promote hot item from MBuffer → LVector."""
@@ -2,23 +2,42 @@ from __future__ import annotations
 """In-memory cache implementations for S/M/L tiers and ColdStore.
 
 Policies:
-    - Eviction: FIFO capacity eviction across all tiers.
-    - TTL: Lazy eviction on access and put, using an injectable clock.
+    - Eviction: FIFO capacity eviction across all tiers (MBuffer: optional 2Q).
+    - TTL: Lazy eviction on access and put (deadline min-heap), using an
+      injectable clock.
     - Oversize (MBuffer): reject single entries exceeding max_tokens.
     - Namespace: optional key prefixing for session/user isolation.
+    - Persistence: ``MMapColdStore`` keeps cold data on disk, index in RAM.
 """
 
-from collections import OrderedDict
+import heapq
+import itertools
+import mmap
+import os
+import struct
+from collections import OrderedDict, deque
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from operator import itemgetter
 from threading import RLock
-from typing import Any, Iterable, Protocol
+from typing import Any, Callable, Iterable, Protocol
+
+import numpy as np
+
+try:
+    import hnswlib
+except ImportError:  # optional ANN backend for LVector(index_type="hnsw")
+    hnswlib = None
 
 from hippoium.ports.port_types import MemTier
 from hippoium.ports.protocols import CacheProtocol
+from hippoium.core.utils.serializer import from_pickle, to_pickle
 from hippoium.core.utils.token_counter import count_tokens
 
 
+_VALUE = itemgetter("value")
+
+
 class Clock(Protocol):
     def now(self) -> datetime: ...
 
@@ -34,6 +53,42 @@ def build_namespaced_key(namespace: str | None, key: str) -> str:
     return key
 
 
+class _ExpiryHeap:
+    """Min-heap of ``(deadline, seq, key)`` for lazy TTL sweeps.
+
+    Entries are never updated in place: refreshing a key pushes a new deadline
+    and the stale one is skipped when popped, because the owning store
+    re-checks the live item before deleting it.
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[datetime, int, str]] = []
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, deadline: datetime, key: str) -> None:
+        heapq.heappush(self._heap, (deadline, next(self._seq), key))
+
+    def pop_due(self, now: datetime) -> list[str]:
+        heap, due = self._heap, []
+        while heap and heap[0][0] < now:
+            due.append(heapq.heappop(heap)[2])
+        return due
+
+    def rebuild(self, entries: Iterable[tuple[datetime, str]]) -> None:
+        self._heap = [(deadline, next(self._seq), key) for deadline, key in entries]
+        heapq.heapify(self._heap)
+
+
+def _deadlines(data: dict[str, dict], ttl: timedelta | None):
+    for key, item in data.items():
+        item_ttl = item.get("ttl", ttl)
+        if item_ttl:
+            yield item["ts"] + item_ttl, key
+
+
 @dataclass(frozen=True)
 class VectorEntry:
     vector: list[float]
@@ -53,7 +108,14 @@ def cosine_similarity(vec1: Iterable[float], vec2: Iterable[float]) -> float:
 
 
 class SCache(CacheProtocol):
-    """Session-level cache with optional TTL and capacity."""
+    """Session-level cache with optional TTL and capacity.
+
+    With ``weigher`` and ``tlru_threshold`` set, capacity eviction is
+    tail-latency aware (T-LRU): the oldest entry lighter than the threshold is
+    evicted first, since short sessions are cheap to rebuild; FIFO otherwise.
+    Weights are cached per entry and recomputed only after ``put``/``touch``
+    (``append``/``extend`` touch), so in-place edits must go through those.
+    """
 
     tier = MemTier.S
 
@@ -63,16 +125,25 @@ class SCache(CacheProtocol):
         ttl: timedelta | None = timedelta(minutes=30),
         clock: "Clock | None" = None,
         namespace: str | None = None,
+        weigher: Callable[[Any], int] | None = None,
+        tlru_threshold: int | None = None,
     ):
         self.capacity = capacity
         self.ttl = ttl
         self.clock = clock or RealClock()
         self.namespace = namespace
+        self.weigher = weigher
+        self.tlru_threshold = tlru_threshold
         self.data: OrderedDict[str, dict] = OrderedDict()
         self._lock = RLock()
+        self._deadlines = _ExpiryHeap()
 
-    def _expired(self, ts: datetime, ttl: timedelta | None) -> bool:
-        return bool(ttl and ts + ttl < self.clock.now())
+    def _expired(
+        self, ts: datetime, ttl: timedelta | None, now: datetime | None = None
+    ) -> bool:
+        if not ttl:
+            return False
+        return ts + ttl < (now if now is not None else self.clock.now())
 
     def get(self, key: str) -> Any | None:
         namespaced = build_namespaced_key(self.namespace, key)
@@ -85,15 +156,29 @@ class SCache(CacheProtocol):
                 return None
             return item["value"]
 
+    def _track(self, namespaced: str, item: dict) -> None:
+        ttl = item.get("ttl", self.ttl)
+        if ttl:
+            self._deadlines.push(item["ts"] + ttl, namespaced)
+        if len(self._deadlines) > 2 * len(self.data) + 32:
+            # mostly stale deadlines from refreshes: compact
+            self._deadlines.rebuild(_deadlines(self.data, self.ttl))
+
     def _evict_expired(self) -> None:
         if not self.ttl:
             return
-        expired = []
-        for k, item in self.data.items():
-            if self._expired(item["ts"], item.get("ttl", self.ttl)):
-                expired.append(k)
-        for k in expired:
-            del self.data[k]
+        # pop only due deadlines (O(k log n)); one clock read per sweep
+        now, ttl = self.clock.now(), self.ttl
+        for k in self._deadlines.pop_due(now):
+            item = self.data.get(k)
+            if item is None:
+                continue
+            item_ttl = item.get("ttl", ttl)
+            if self._expired(item["ts"], item_ttl, now):
+                del self.data[k]
+            elif item_ttl:
+                # not due yet (e.g. ttl changed since it was pushed): re-arm
+                self._deadlines.push(item["ts"] + item_ttl, k)
 
     def put(self, key: str, value: Any, ttl: int | None = None) -> None:
         namespaced = build_namespaced_key(self.namespace, key)
@@ -101,18 +186,72 @@ class SCache(CacheProtocol):
         ttl_delta = timedelta(seconds=ttl) if ttl else None
         with self._lock:
             self._evict_expired()
-            if namespaced in self.data:
-                self.data[namespaced]["value"] = value
-                self.data[namespaced]["ts"] = now
+            item = self.data.get(namespaced)
+            if item is not None:
+                item["value"] = value
+                item.pop("w", None)  # re-weigh on next eviction
+                item["ts"] = now
                 if ttl_delta is not None:
-                    self.data[namespaced]["ttl"] = ttl_delta
+                    item["ttl"] = ttl_delta
+                self._track(namespaced, item)
                 return
             if self.capacity is not None and self.capacity > 0 and len(self.data) >= self.capacity:
-                self.data.popitem(last=False)
+                self._evict_one()
             payload = {"value": value, "ts": now}
             if ttl_delta is not None:
                 payload["ttl"] = ttl_delta
             self.data[namespaced] = payload
+            self._track(namespaced, payload)
+
+    def _evict_one(self) -> None:
+        if self.weigher is not None and self.tlru_threshold is not None:
+            for k, item in self.data.items():
+                # cached until the entry is rewritten or touched
+                weight = item.get("w")
+                if weight is None:
+                    weight = item["w"] = self.weigher(item["value"])
+                if weight < self.tlru_threshold:
+                    del self.data[k]
+                    return
+        self.data.popitem(last=False)
+
+    def touch(self, key: str) -> bool:
+        """Refresh an entry's timestamp in place; False if missing or expired.
+
+        Lets callers that mutate a stored container skip a full ``put``.
+        """
+        namespaced = build_namespaced_key(self.namespace, key)
+        with self._lock:
+            item = self.data.get(namespaced)
+            if not item:
+                return False
+            if self._expired(item["ts"], item.get("ttl", self.ttl)):
+                del self.data[namespaced]
+                return False
+            item["ts"] = self.clock.now()
+            item.pop("w", None)  # value may have been mutated in place
+            self._track(namespaced, item)
+            return True
+
+    def append(self, key: str, item: Any, maxlen: int | None = None) -> deque:
+        """Append ``item`` to the deque stored at ``key``, creating it on miss.
+
+        The deque is mutated in place and only the timestamp is refreshed, so a
+        growing history costs O(1) per call instead of a full ``put``.
+        """
+        return self.extend(key, (item,), maxlen=maxlen)
+
+    def extend(self, key: str, items: Iterable[Any], maxlen: int | None = None) -> deque:
+        """Like ``append`` for several items: one lookup and one refresh."""
+        with self._lock:
+            history = self.get(key)
+            if history is None:
+                history = deque(items, maxlen=maxlen)
+                self.put(key, history)
+                return history
+            history.extend(items)
+            self.touch(key)
+            return history
 
     def delete(self, key: str) -> None:
         namespaced = build_namespaced_key(self.namespace, key)
@@ -127,6 +266,12 @@ class MBuffer(CacheProtocol):
     Oversize policy:
         If a single message exceeds ``max_tokens``, the put is rejected with a
         ``ValueError`` so callers can handle the oversize payload explicitly.
+
+    Eviction policy:
+        ``"fifo"`` (default) evicts oldest-first. ``"2q"`` keeps new entries in
+        a FIFO probation queue (A1in) and promotes them to an LRU queue (Am) on
+        a repeat ``get``; A1in is drained first while it holds more than
+        ``a1_ratio`` of the entries. ``data`` keeps insertion order either way.
     """
 
     tier = MemTier.M
@@ -138,18 +283,40 @@ class MBuffer(CacheProtocol):
         ttl: timedelta | None = timedelta(minutes=30),
         clock: "Clock | None" = None,
         namespace: str | None = None,
+        policy: str = "fifo",
+        a1_ratio: float = 0.25,
     ):
+        if policy not in ("fifo", "2q"):
+            raise ValueError(f"Unknown MBuffer policy: {policy}")
         self.max_messages = max_messages
         self.max_tokens = max_tokens
         self.ttl = ttl
         self.clock = clock or RealClock()
         self.namespace = namespace
+        self.policy = policy
+        self.a1_ratio = a1_ratio
         self.data: OrderedDict[str, dict] = OrderedDict()
         self._token_count: int = 0
         self._lock = RLock()
-
-    def _expired(self, ts: datetime, ttl: timedelta | None) -> bool:
-        return bool(ttl and ts + ttl < self.clock.now())
+        # 2Q bookkeeping: probation FIFO and frequently-used LRU (keys only)
+        self._a1: OrderedDict[str, None] = OrderedDict()
+        self._am: OrderedDict[str, None] = OrderedDict()
+        self._deadlines = _ExpiryHeap()
+
+    def _expired(
+        self, ts: datetime, ttl: timedelta | None, now: datetime | None = None
+    ) -> bool:
+        if not ttl:
+            return False
+        return ts + ttl < (now if now is not None else self.clock.now())
+
+    def _remove(self, namespaced: str) -> dict:
+        item = self.data.pop(namespaced)
+        self._token_count -= item["len"]
+        if self.policy == "2q":
+            self._a1.pop(namespaced, None)
+            self._am.pop(namespaced, None)
+        return item
 
     def get(self, key: str) -> Any | None:
         namespaced = build_namespaced_key(self.namespace, key)
@@ -158,33 +325,68 @@ class MBuffer(CacheProtocol):
             if not item:
                 return None
             if self._expired(item["ts"], item.get("ttl", self.ttl)):
-                self._token_count -= item["len"]
-                del self.data[namespaced]
+                self._remove(namespaced)
                 return None
+            if self.policy == "2q":
+                if namespaced in self._a1:
+                    del self._a1[namespaced]
+                    self._am[namespaced] = None
+                else:
+                    self._am.move_to_end(namespaced)
             return item["value"]
 
     def _evict_expired(self) -> None:
         if not self.ttl:
             return
-        expired = []
-        for k, item in self.data.items():
-            if self._expired(item["ts"], item.get("ttl", self.ttl)):
-                expired.append((k, item["len"]))
-        for k, length in expired:
-            del self.data[k]
-            self._token_count -= length
+        # pop only due deadlines (O(k log n)); one clock read per sweep
+        now, ttl = self.clock.now(), self.ttl
+        for k in self._deadlines.pop_due(now):
+            item = self.data.get(k)
+            if item is None:
+                continue
+            item_ttl = item.get("ttl", ttl)
+            if self._expired(item["ts"], item_ttl, now):
+                self._remove(k)
+            elif item_ttl:
+                # not due yet (e.g. ttl changed since it was pushed): re-arm
+                self._deadlines.push(item["ts"] + item_ttl, k)
+
+    def _next_victim(self) -> str:
+        if self.policy == "fifo":
+            return next(iter(self.data))
+        if self._a1 and (
+            not self._am or len(self._a1) > len(self.data) * self.a1_ratio
+        ):
+            return next(iter(self._a1))
+        return next(iter(self._am))
 
     def _evict_count(self) -> None:
         if self.max_messages is not None and self.max_messages > 0:
             while len(self.data) >= self.max_messages:
-                _, val = self.data.popitem(last=False)
-                self._token_count -= val["len"]
+                self._remove(self._next_victim())
 
     def _evict_tokens(self, new_len: int) -> None:
-        if self.max_tokens is not None and self.max_tokens > 0:
-            while self._token_count + new_len > self.max_tokens and len(self.data) > 0:
-                _, val = self.data.popitem(last=False)
-                self._token_count -= val["len"]
+        if self.max_tokens is None or self.max_tokens <= 0:
+            return
+        to_free = self._token_count + new_len - self.max_tokens
+        if to_free <= 0:
+            return
+        if self.policy == "2q":
+            while self.data and self._token_count + new_len > self.max_tokens:
+                self._remove(self._next_victim())
+            return
+        # Walk oldest-first until enough tokens are freed, then settle the
+        # running counter once instead of per popped entry.
+        freed = 0
+        victims = []
+        for k, item in self.data.items():
+            victims.append(k)
+            freed += item["len"]
+            if freed >= to_free:
+                break
+        for k in victims:
+            del self.data[k]
+        self._token_count -= freed
 
     def put(self, key: str, value: str, ttl: int | None = None) -> None:
         namespaced = build_namespaced_key(self.namespace, key)
@@ -195,10 +397,9 @@ class MBuffer(CacheProtocol):
         ttl_delta = timedelta(seconds=ttl) if ttl else None
         with self._lock:
             self._evict_expired()
+            hot = namespaced in self._am
             if namespaced in self.data:
-                old = self.data[namespaced]
-                self._token_count -= old["len"]
-                del self.data[namespaced]
+                self._remove(namespaced)
             self._evict_count()
             self._evict_tokens(new_len)
             payload = {"value": value, "ts": now, "len": new_len}
@@ -206,25 +407,85 @@ class MBuffer(CacheProtocol):
                 payload["ttl"] = ttl_delta
             self.data[namespaced] = payload
             self._token_count += new_len
+            item_ttl = payload.get("ttl", self.ttl)
+            if item_ttl:
+                self._deadlines.push(now + item_ttl, namespaced)
+            if len(self._deadlines) > 2 * len(self.data) + 32:
+                self._deadlines.rebuild(_deadlines(self.data, self.ttl))
+            if self.policy == "2q":
+                # rewriting a hot key keeps it hot; new keys start on probation
+                (self._am if hot else self._a1)[namespaced] = None
+
+    def values(self) -> list[str]:
+        """Snapshot of buffered values in insertion (chronological) order."""
+        with self._lock:
+            return list(map(_VALUE, self.data.values()))
 
     def delete(self, key: str) -> None:
         namespaced = build_namespaced_key(self.namespace, key)
         with self._lock:
             if namespaced in self.data:
-                self._token_count -= self.data[namespaced]["len"]
-                del self.data[namespaced]
+                self._remove(namespaced)
 
 
 class LVector(CacheProtocol):
-    """Long-term vector store (FIFO capacity control + cosine similarity search)."""
+    """Long-term vector store (FIFO capacity control + cosine similarity search).
+
+    Vector entries are mirrored into a row-normalised NumPy matrix so a search
+    is one matrix-vector product. New keys append a row (amortised O(d));
+    overwrites, deletes and evictions mark the matrix stale and it is rebuilt
+    on the next search.
+
+    ``index_type="hnsw"`` additionally mirrors vectors into an ``hnswlib``
+    graph and answers searches approximately once at least ``ann_min_items``
+    vectors are stored; smaller stores, non-positive ``top_k`` and setups
+    without ``hnswlib`` use the exact scan.
+
+    ``dtype`` sets the storage type of the search matrix (the stored
+    ``VectorEntry`` values are untouched): ``"float32"``/``"float16"`` halve
+    or quarter it, ``"int8"`` keeps one byte per component plus a per-row
+    scale. Reduced types are scored in float32 blocks, so scores carry their
+    rounding error (roughly 1e-4 for float16, a few 1e-3 for int8).
+    """
 
     tier = MemTier.L
+    _INDEX_DTYPES = ("float64", "float32", "float16", "int8")
+    _SCORE_BLOCK = 4096  # rows upcast per block when scoring reduced dtypes
 
-    def __init__(self, capacity: int | None = None, namespace: str | None = None):
+    def __init__(
+        self,
+        capacity: int | None = None,
+        namespace: str | None = None,
+        index_type: str = "flat",
+        ann_min_items: int = 2048,
+        ann_ef: int = 64,
+        dtype: str = "float64",
+    ):
+        if index_type not in ("flat", "hnsw"):
+            raise ValueError(f"Unknown LVector index_type: {index_type}")
+        if dtype not in self._INDEX_DTYPES:
+            raise ValueError(f"Unknown LVector dtype: {dtype}")
         self.capacity = capacity
         self.namespace = namespace
+        self.index_type = index_type
+        self.ann_min_items = ann_min_items
+        self.ann_ef = ann_ef
+        self.dtype = dtype
         self.data: OrderedDict[str, Any] = OrderedDict()
         self._lock = RLock()
+        # HNSW mirror: key <-> integer label; deleted labels are only marked
+        self._ann: Any = None
+        self._ann_enabled = index_type == "hnsw" and hnswlib is not None
+        self._ann_labels: dict[str, int] = {}
+        self._ann_keys: dict[int, str] = {}
+        self._ann_next = 0
+        # search index over VectorEntry values, in self.data order
+        self._index_valid = True
+        self._keys: list[str] = []
+        self._payloads: list[Any] = []
+        self._matrix: np.ndarray | None = None  # (capacity, d) unit rows
+        self._scales: np.ndarray | None = None  # int8 only: per-row dequant scale
+        self._rows = 0
 
     def get(self, key: str) -> Any | None:
         namespaced = build_namespaced_key(self.namespace, key)
@@ -234,9 +495,42 @@ class LVector(CacheProtocol):
     def put(self, key: str, value: Any, ttl: int | None = None) -> None:
         namespaced = build_namespaced_key(self.namespace, key)
         with self._lock:
+            stale = namespaced in self.data
             if self.capacity is not None and self.capacity > 0 and len(self.data) >= self.capacity:
-                self.data.popitem(last=False)
+                evicted, _ = self.data.popitem(last=False)
+                self._ann_remove(evicted)
+                stale = True
             self.data[namespaced] = value
+            if stale:
+                self._index_valid = False
+            elif self._index_valid and isinstance(value, VectorEntry):
+                self._append_row(namespaced, value)
+            if self._ann_enabled:
+                self._ann_remove(namespaced)
+                if isinstance(value, VectorEntry):
+                    self._ann_add(namespaced, value)
+
+    def append(self, key: str, value: Any, max_per_key: int | None = 256) -> None:
+        """Append ``value`` under ``key``, keeping at most ``max_per_key`` items."""
+        self.extend(key, (value,), max_per_key=max_per_key)
+
+    def extend(self, key: str, values: Iterable[Any], max_per_key: int | None = 256) -> None:
+        """Append several ``values`` under ``key`` in one pass (see ``append``)."""
+        namespaced = build_namespaced_key(self.namespace, key)
+        with self._lock:
+            items = self.data.get(namespaced)
+            if isinstance(items, deque) and items.maxlen == max_per_key:
+                items.extend(values)
+                return
+            if items is None:
+                previous: Iterable[Any] = ()
+            elif isinstance(items, (deque, list)):
+                previous = items
+            else:
+                previous = (items,)
+            ring = deque(previous, maxlen=max_per_key)
+            ring.extend(values)
+            self.put(key, ring)
 
     def put_vector(self, key: str, vector: list[float], payload: Any) -> None:
         self.put(key, VectorEntry(vector=vector, payload=payload))
@@ -244,21 +538,177 @@ class LVector(CacheProtocol):
     def add(self, key: str, vector: list[float], payload: Any) -> None:
         self.put_vector(key, vector, payload)
 
+    @staticmethod
+    def _unit_rows(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0  # zero vectors score 0 against everything
+        return matrix / norms
+
+    def _quantize(self, rows: np.ndarray) -> tuple[np.ndarray, np.ndarray | None]:
+        """Cast unit rows to the index dtype; int8 also returns row scales."""
+        if self.dtype != "int8":
+            return rows.astype(self.dtype, copy=False), None
+        scales = np.abs(rows).max(axis=-1, keepdims=True, initial=0.0) / 127.0
+        scales = np.where(scales == 0, 1.0, scales)
+        codes = np.rint(rows / scales).astype(np.int8)
+        return codes, scales[..., 0].astype(np.float32)
+
+    def _append_row(self, key: str, entry: VectorEntry) -> None:
+        try:
+            row = np.asarray(entry.vector, dtype=np.float64)
+        except (TypeError, ValueError):
+            self._index_valid = False
+            return
+        matrix = self._matrix
+        if matrix is None and self._rows == 0 and row.ndim == 1:
+            matrix = self._matrix = np.empty((16, row.shape[0]), dtype=self.dtype)
+            if self.dtype == "int8":
+                self._scales = np.empty(16, dtype=np.float32)
+        if matrix is None or row.shape != matrix.shape[1:]:
+            self._index_valid = False  # ragged dims: rebuild decides
+            return
+        if self._rows == matrix.shape[0]:
+            grown = np.empty((2 * self._rows, matrix.shape[1]), dtype=matrix.dtype)
+            grown[: self._rows] = matrix
+            matrix = self._matrix = grown
+            if self._scales is not None:
+                self._scales = np.concatenate((self._scales, np.empty_like(self._scales)))
+        codes, scales = self._quantize(self._unit_rows(row))
+        matrix[self._rows] = codes
+        if scales is not None:
+            self._scales[self._rows] = scales
+        self._rows += 1
+        self._keys.append(key)
+        self._payloads.append(entry.payload)
+
+    def _ann_add(self, key: str, entry: VectorEntry) -> None:
+        try:
+            row = np.asarray(entry.vector, dtype=np.float32)
+        except (TypeError, ValueError):
+            row = None
+        if self._ann is None and row is not None and row.ndim == 1 and row.size:
+            self._ann = hnswlib.Index(space="cosine", dim=row.shape[0])
+            self._ann.init_index(
+                max_elements=max(self.capacity or 0, 1024), ef_construction=200, M=16
+            )
+            self._ann.set_ef(self.ann_ef)
+        if row is None or self._ann is None or row.shape != (self._ann.dim,):
+            # mixed dimensions cannot share one graph: stay on the exact scan
+            self._ann = None
+            self._ann_enabled = False
+            self._ann_labels.clear()
+            self._ann_keys.clear()
+            return
+        if self._ann_next >= self._ann.get_max_elements():
+            self._ann.resize_index(2 * self._ann.get_max_elements())
+        label = self._ann_next
+        self._ann_next += 1
+        self._ann.add_items(row[None, :], [label])
+        self._ann_labels[key] = label
+        self._ann_keys[label] = key
+
+    def _ann_remove(self, key: str) -> None:
+        label = self._ann_labels.pop(key, None)
+        if label is not None:
+            del self._ann_keys[label]
+            self._ann.mark_deleted(label)
+
+    def _ann_search(
+        self, query: list[float], top_k: int
+    ) -> list[tuple[str, Any, float]] | None:
+        live = len(self._ann_labels)
+        if self._ann is None or live < self.ann_min_items or top_k <= 0:
+            return None
+        q = np.asarray(query, dtype=np.float32)
+        if q.shape != (self._ann.dim,):
+            return None
+        try:
+            labels, distances = self._ann.knn_query(q[None, :], k=min(top_k, live))
+        except RuntimeError:  # too many deleted neighbours for this ef
+            return None
+        keys = self._ann_keys
+        results = []
+        for label, dist in zip(labels[0], distances[0]):
+            key = keys[int(label)]
+            results.append((key, self.data[key].payload, 1.0 - float(dist)))
+        return results
+
+    def _rebuild_index(self) -> None:
+        self._keys, self._payloads, vectors = [], [], []
+        for key, value in self.data.items():
+            if isinstance(value, VectorEntry):
+                self._keys.append(key)
+                self._payloads.append(value.payload)
+                vectors.append(value.vector)
+        try:
+            matrix = np.asarray(vectors, dtype=np.float64)
+        except (TypeError, ValueError):  # ragged dimensions
+            matrix = None
+        if matrix is not None and (matrix.ndim != 2 or not vectors):
+            matrix = None
+        if matrix is None:
+            self._matrix = self._scales = None
+        else:
+            self._matrix, self._scales = self._quantize(self._unit_rows(matrix))
+        self._rows = len(self._keys)
+        self._index_valid = True
+
+    def _scores(self, matrix: np.ndarray, n: int, unit_q: np.ndarray) -> np.ndarray:
+        if matrix.dtype == np.float64:
+            return matrix[:n] @ unit_q
+        q32 = unit_q.astype(np.float32)
+        if matrix.dtype == np.float32:
+            scores = matrix[:n] @ q32
+        else:
+            # upcast a block at a time so the temporary stays small
+            scores = np.empty(n, dtype=np.float32)
+            for start in range(0, n, self._SCORE_BLOCK):
+                stop = min(start + self._SCORE_BLOCK, n)
+                scores[start:stop] = matrix[start:stop].astype(np.float32) @ q32
+        if self._scales is not None:
+            scores *= self._scales[:n]
+        return scores
+
     def similarity_search(self, query_vector: Iterable[float], top_k: int = 5) -> list[tuple[str, Any, float]]:
-        scored: list[tuple[str, Any, float]] = []
+        query = list(query_vector)
         with self._lock:
-            for key, value in self.data.items():
-                if isinstance(value, VectorEntry):
-                    score = cosine_similarity(query_vector, value.vector)
-                    scored.append((key, value.payload, score))
-        scored.sort(key=lambda item: item[2], reverse=True)
-        return scored[:top_k]
+            if self._ann_enabled:
+                approx = self._ann_search(query, top_k)
+                if approx is not None:
+                    return approx
+            if not self._index_valid:
+                self._rebuild_index()
+            matrix, keys, payloads, n = self._matrix, self._keys, self._payloads, self._rows
+            if n == 0:
+                return []
+            q = np.asarray(query, dtype=np.float64)
+            if matrix is None or q.shape != matrix.shape[1:]:
+                # mixed or mismatched dimensions: per-entry cosine (zip semantics)
+                scored = [
+                    (key, value.payload, cosine_similarity(query, value.vector))
+                    for key, value in self.data.items()
+                    if isinstance(value, VectorEntry)
+                ]
+                scored.sort(key=lambda item: item[2], reverse=True)
+                return scored[:top_k]
+            scores = self._scores(matrix, n, self._unit_rows(q))
+            if 0 < top_k < n:
+                # argpartition finds the k-th best; keep every tie at that score
+                # so the stable sort reproduces insertion order among equals
+                kth = scores[np.argpartition(-scores, top_k - 1)[top_k - 1]]
+                candidates = np.flatnonzero(scores >= kth)
+                order = candidates[np.argsort(-scores[candidates], kind="stable")]
+            else:
+                order = np.argsort(-scores, kind="stable")
+            return [(keys[i], payloads[i], float(scores[i])) for i in order[:top_k]]
 
     def delete(self, key: str) -> None:
         namespaced = build_namespaced_key(self.namespace, key)
         with self._lock:
             if namespaced in self.data:
                 del self.data[namespaced]
+                self._index_valid = False
+                self._ann_remove(namespaced)
 
 
 class ColdStore(CacheProtocol):
@@ -289,3 +739,107 @@ class ColdStore(CacheProtocol):
         with self._lock:
             if namespaced in self.data:
                 del self.data[namespaced]
+
+
+class MMapColdStore(CacheProtocol):
+    """Persistent cold storage backed by an append-only file and ``mmap``.
+
+    Each record is ``<key_len:u32><payload_len:u32><key><payload>`` where the
+    payload is the pickled value. Only the ``{key: (offset, length)}`` index
+    lives in memory; reads unpickle straight from the mapped pages. Deletes
+    append a tombstone so the index can be rebuilt on reopen.
+    """
+
+    tier = MemTier.COLD
+    _HEADER = struct.Struct("<II")
+    _TOMBSTONE = 0xFFFFFFFF
+
+    def __init__(self, path: str | os.PathLike, namespace: str | None = None):
+        self.path = os.fspath(path)
+        self.namespace = namespace
+        self._index: dict[str, tuple[int, int]] = {}
+        self._lock = RLock()
+        self._fp = open(self.path, "a+b")
+        self._mm: mmap.mmap | None = None
+        self._remap()
+        self._load_index()
+
+    def _remap(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._fp.flush()
+        size = os.fstat(self._fp.fileno()).st_size
+        if size:
+            self._mm = mmap.mmap(self._fp.fileno(), size, access=mmap.ACCESS_READ)
+
+    def _load_index(self) -> None:
+        mm = self._mm
+        if mm is None:
+            return
+        pos, end = 0, len(mm)
+        header = self._HEADER
+        while pos + header.size <= end:
+            key_len, payload_len = header.unpack_from(mm, pos)
+            body = pos + header.size + key_len
+            record_end = body if payload_len == self._TOMBSTONE else body + payload_len
+            if record_end > end:
+                break  # torn tail from an interrupted append
+            try:
+                key = mm[pos + header.size:body].decode("utf-8")
+            except UnicodeDecodeError:
+                break
+            if payload_len == self._TOMBSTONE:
+                self._index.pop(key, None)
+            else:
+                self._index[key] = (body, payload_len)
+            pos = record_end
+        if pos < end:
+            # drop the partial record so new appends follow the last good one
+            mm.close()
+            self._mm = None
+            self._fp.truncate(pos)
+            self._remap()
+
+    def _append(self, key: str, payload: bytes | None) -> int:
+        key_bytes = key.encode("utf-8")
+        payload_len = self._TOMBSTONE if payload is None else len(payload)
+        self._fp.seek(0, os.SEEK_END)
+        offset = self._fp.tell() + self._HEADER.size + len(key_bytes)
+        self._fp.write(self._HEADER.pack(len(key_bytes), payload_len) + key_bytes)
+        if payload is not None:
+            self._fp.write(payload)
+        self._fp.flush()
+        return offset
+
+    def get(self, key: str) -> Any | None:
+        namespaced = build_namespaced_key(self.namespace, key)
+        with self._lock:
+            loc = self._index.get(namespaced)
+            if loc is None:
+                return None
+            offset, length = loc
+            if self._mm is None or offset + length > len(self._mm):
+                self._remap()
+            return from_pickle(memoryview(self._mm)[offset:offset + length])
+
+    def put(self, key: str, value: Any, ttl: int | None = None) -> None:
+        namespaced = build_namespaced_key(self.namespace, key)
+        payload = to_pickle(value)
+        with self._lock:
+            offset = self._append(namespaced, payload)
+            self._index[namespaced] = (offset, len(payload))
+
+    def delete(self, key: str) -> None:
+        namespaced = build_namespaced_key(self.namespace, key)
+        with self._lock:
+            if namespaced in self._index:
+                self._append(namespaced, None)
+                del self._index[namespaced]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._mm is not None:
+                self._mm.close()
+                self._mm = None
+            self._fp.close()
@@ -4,25 +4,51 @@ from __future__ import annotations
 This module provides a simple :class:`LocalWriteBack` that persists
 `Artifact` instances into a shared :class:`ColdStore`. Artifacts are
 identified by a checksum computed from their payload. The checksum is
-also used as default ID if the artifact lacks one.
+also used as default ID if the artifact lacks one. Passing ``path``
+switches the backing to :class:`MMapColdStore` so artifacts survive
+restarts without being held in the Python heap.
 """
-from hippoium.ports.protocols import WriteBackAPI
+import os
+from typing import Any
+
+from hippoium.ports.protocols import CacheProtocol, WriteBackAPI
 from hippoium.ports.port_types import Artifact
-from hippoium.core.memory.stores import ColdStore
+from hippoium.core.memory.stores import ColdStore, MMapColdStore
 from hippoium.core.utils.hasher import hash_text
 
 
 class LocalWriteBack(WriteBackAPI):
-    """Persist artifacts into an in-memory cold store.
+    """Persist artifacts into a cold store (in-memory unless ``path`` is given).
 
     This basic implementation is intended for local development and
-    testing. It computes a SHA-1 checksum of the artifact's data,
+    testing. It computes a BLAKE2b checksum of the artifact's data,
     stores the raw payload into :class:`ColdStore`, and returns the
     artifact's identifier as a reference string.
     """
 
-    def __init__(self, store: ColdStore | None = None) -> None:
-        self.store = store or ColdStore()
+    def __init__(
+        self,
+        store: CacheProtocol | None = None,
+        path: str | os.PathLike | None = None,
+    ) -> None:
+        # only a store created here is closed by close()
+        self._owns_store = store is None
+        if store is None:
+            store = MMapColdStore(path) if path is not None else ColdStore()
+        self.store = store
+
+    def close(self) -> None:
+        """Release the file handle and mapping of a store this instance created."""
+        if self._owns_store:
+            close = getattr(self.store, "close", None)
+            if close is not None:
+                close()
+
+    def __enter__(self) -> "LocalWriteBack":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
 
     def write(self, artifact: Artifact) -> str:
         """Persist ``artifact`` and return its reference ID.
@@ -44,3 +70,7 @@ class LocalWriteBack(WriteBackAPI):
         # Persist the raw data in the cold store.
         self.store.put(artifact.id, artifact.data)
         return artifact.id
+
+    def read(self, aid: str) -> Any | None:
+        """Return the payload previously written under ``aid``."""
+        return self.store.get(aid)
@@ -1,23 +1,20 @@
 # hippoium/core/neg_vault.py  (New module for Negative Prompt Vault)
-from typing import List
+from typing import Dict, List
 
 class NegativeVault:
     """Global repository for negative prompt examples."""
-    _vault: List[str] = []
+    # insertion-ordered dict used as an ordered set: O(1) dedup and removal
+    _vault: Dict[str, None] = {}
 
     @classmethod
     def add_example(cls, prompt: str) -> None:
         """Add a negative prompt example to the vault (if not duplicate)."""
-        if prompt not in cls._vault:
-            cls._vault.append(prompt)
+        cls._vault.setdefault(prompt, None)
 
     @classmethod
     def remove_example(cls, prompt: str) -> None:
         """Remove a prompt from the vault if it exists."""
-        try:
-            cls._vault.remove(prompt)
-        except ValueError:
-            pass  # ignore if not present
+        cls._vault.pop(prompt, None)  # ignore if not present
 
     @classmethod
     def list_examples(cls) -> List[str]:
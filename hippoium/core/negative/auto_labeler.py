@@ -7,16 +7,18 @@ from hippoium.ports.domain import Message
 from hippoium.ports.port_types import MsgLabel
 
 
-_ERR_PATTERNS = [
-    re.compile(r"^\s*Error:", re.I),
-    re.compile(r"exception", re.I),
-]
+# One case-insensitive scan covers both the error markers and TODO; this
+# avoids building a lowered copy of the message for the TODO check.
+_LABEL_RE = re.compile(r"(?P<err>^\s*Error:|exception)|(?P<todo>todo)", re.I)
+_ERR_TAIL_RE = re.compile(r"exception", re.I)
 
 
 def label(msg: Message) -> MsgLabel:
-    for pat in _ERR_PATTERNS:
-        if pat.search(msg.content):
-            return MsgLabel.ERR
-    if "todo" in msg.content.lower():
-        return MsgLabel.TODO
-    return MsgLabel.OK
+    content = msg.content
+    m = _LABEL_RE.search(content)
+    if m is None:
+        return MsgLabel.OK
+    # ERR outranks TODO even when the TODO marker appears first.
+    if m.lastgroup == "err" or _ERR_TAIL_RE.search(content, m.end()):
+        return MsgLabel.ERR
+    return MsgLabel.TODO
@@ -6,7 +6,7 @@ from dataclasses import asdict
 from pathlib import Path
 from typing import List
 from hippoium.ports.domain import Message
-from hippoium.core.utils.serializer import to_json, from_json
+from hippoium.core.utils.serializer import from_json_bytes, to_json_bytes
 
 
 class NegVaultStore:
@@ -14,21 +14,23 @@ class NegVaultStore:
         self.path = Path(path)
 
     def add(self, msg: Message):
-        with self.path.open("a", encoding="utf-8") as fp:
-            fp.write(to_json(asdict(msg)) + "\n")
+        with self.path.open("ab") as fp:
+            fp.write(to_json_bytes(asdict(msg)) + b"\n")
 
     def load(self) -> List[Message]:
         if not self.path.exists():
             return []
-        with self.path.open(encoding="utf-8") as fp:
-            messages: List[Message] = []
-            for line in fp:
-                data = from_json(line)
-                messages.append(
-                    Message(
-                        role=data.get("role", ""),
-                        content=data.get("content", ""),
-                        metadata=data.get("metadata") or {},
-                    )
+        # Read once and split in memory; one JSON decode per non-empty line.
+        messages: List[Message] = []
+        for line in self.path.read_bytes().splitlines():
+            if not line.strip():
+                continue
+            data = from_json_bytes(line)
+            messages.append(
+                Message(
+                    role=data.get("role", ""),
+                    content=data.get("content", ""),
+                    metadata=data.get("metadata") or {},
                 )
-            return messages
+            )
+        return messages
@@ -2,10 +2,30 @@ from __future__ import annotations
 
 """Multi-source RAG retriever with negative filtering and deduplication."""
 
+import os
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from difflib import SequenceMatcher
 from pathlib import Path
+from threading import Lock
 from typing import List, Callable, Optional, Union, Any
 
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional speed-up
+    ahocorasick = None
+
+# Below this many phrases, chained ``in`` checks beat an automaton pass.
+_AUTOMATON_MIN_PHRASES = 5
+
+# LocalFileSource read cache: one entry per path (latest version only), LRU
+# evicted once the cached texts exceed this many characters in total.
+_FILE_CACHE_MAX_CHARS = 16 << 20
+_file_cache: OrderedDict[str, tuple[int, int, str]] = OrderedDict()
+_file_cache_chars = 0
+_file_cache_lock = Lock()
+
 
 class Document:
     """Simple document wrapper holding content and source information."""
@@ -28,31 +48,84 @@ class BaseSource:
         raise NotImplementedError
 
 
+def _read_text(path: str, mtime_ns: int, size: int) -> str:
+    """Read a UTF-8 file, reusing the cached text while (mtime, size) match so
+    unchanged files are not re-read when sources are rebuilt."""
+    global _file_cache_chars
+    with _file_cache_lock:
+        cached = _file_cache.get(path)
+        if cached is not None and cached[:2] == (mtime_ns, size):
+            _file_cache.move_to_end(path)
+            return cached[2]
+    text = Path(path).read_text(encoding="utf-8")
+    if len(text) > _FILE_CACHE_MAX_CHARS:
+        return text
+    with _file_cache_lock:
+        old = _file_cache.pop(path, None)
+        if old is not None:
+            _file_cache_chars -= len(old[2])
+        _file_cache[path] = (mtime_ns, size, text)
+        _file_cache_chars += len(text)
+        while _file_cache_chars > _FILE_CACHE_MAX_CHARS:
+            _, (_, _, dropped) = _file_cache.popitem(last=False)
+            _file_cache_chars -= len(dropped)
+    return text
+
+
+def _clear_file_cache() -> None:
+    global _file_cache_chars
+    with _file_cache_lock:
+        _file_cache.clear()
+        _file_cache_chars = 0
+
+
+def _keyword_search(
+    documents: List[Document], query: str, lowered: dict[str, str]
+) -> List[Document]:
+    """Return documents containing every query term, best term count first.
+
+    ``lowered`` memoizes ``content.lower()`` per content string, so repeated
+    queries over the same records do not re-lowercase the whole corpus.
+    """
+    results: List[Document] = []
+    query_terms = query.lower().split()
+    for doc in documents:
+        content = doc.content
+        text_lower = lowered.get(content)
+        if text_lower is None:
+            text_lower = lowered[content] = content.lower()
+        if all(term in text_lower for term in query_terms):
+            doc.score = sum(text_lower.count(term) for term in query_terms)
+            results.append(doc)
+    results.sort(key=lambda d: d.score or 0, reverse=True)
+    return results
+
+
 class LocalFileSource(BaseSource):
     """Retrieve documents from local text files or direct text snippets."""
 
     def __init__(self, file_paths: List[str]):
         self.documents: List[Document] = []
+        self._lowered: dict[str, str] = {}
         for path in file_paths:
             text: str
-            p = Path(path)
-            if p.exists():
-                text = p.read_text(encoding="utf-8")
-            else:
+            try:
+                st = os.stat(path)
+            except (OSError, ValueError):
                 # treat path string as literal content
                 text = path
+            else:
+                text = _read_text(os.fspath(path), st.st_mtime_ns, st.st_size)
             self.documents.append(Document(content=text, source=f"file:{path}", metadata={"path": str(path)}))
 
+    @staticmethod
+    def clear_cache() -> None:
+        """Forget cached file contents (e.g. after rewriting a file within the
+        same mtime tick)."""
+        _clear_file_cache()
+
     def search(self, query: str) -> List[Document]:
-        results: List[Document] = []
-        query_terms = query.lower().split()
-        for doc in self.documents:
-            text_lower = doc.content.lower()
-            if all(term in text_lower for term in query_terms):
-                doc.score = sum(text_lower.count(term) for term in query_terms)
-                results.append(doc)
-        results.sort(key=lambda d: d.score or 0, reverse=True)
-        return results
+        return _keyword_search(self.documents, query, self._lowered)
 
 
 class APISource(BaseSource):
@@ -90,6 +163,7 @@ class DatabaseSource(BaseSource):
 
     def __init__(self, records: List[Union[str, Document, dict]]):
         self.documents: List[Document] = []
+        self._lowered: dict[str, str] = {}
         for rec in records:
             if isinstance(rec, Document):
                 self.documents.append(rec)
@@ -102,15 +176,7 @@ class DatabaseSource(BaseSource):
                 self.documents.append(Document(content=text, source="db", metadata=rec))
 
     def search(self, query: str) -> List[Document]:
-        results: List[Document] = []
-        query_terms = query.lower().split()
-        for doc in self.documents:
-            text_lower = doc.content.lower()
-            if all(term in text_lower for term in query_terms):
-                doc.score = sum(text_lower.count(term) for term in query_terms)
-                results.append(doc)
-        results.sort(key=lambda d: d.score or 0, reverse=True)
-        return results
+        return _keyword_search(self.documents, query, self._lowered)
 
 
 class MultiSourceRetriever:
@@ -124,16 +190,27 @@ class MultiSourceRetriever:
         negative_threshold: float = 0.8,
         dedup_threshold: float = 0.9,
         similarity_func: Callable[[str, str], float] | None = None,
+        max_workers: int = 8,
     ) -> None:
         self.sources = list(sources) if sources else []
         self.negative_phrases = [p.lower() for p in (negative_phrases or [])]
         self.negative_texts = negative_texts or []
         self.negative_threshold = negative_threshold
         self.dedup_threshold = dedup_threshold
+        # With the default ratio, negative and dedup checks go through reusable
+        # SequenceMatchers (see _ratio_reaches) instead of similarity_func.
+        self._default_similarity = similarity_func is None
         if similarity_func is None:
             self.similarity_func = lambda a, b: SequenceMatcher(None, a, b).ratio()
         else:
             self.similarity_func = similarity_func
+        self.max_workers = max_workers
+        self._pool: ThreadPoolExecutor | None = None
+        # shuts the pool down if the retriever is collected without close()
+        self._pool_finalizer: weakref.finalize | None = None
+        self._pool_lock = Lock()
+        self._phrase_automaton: Any = None
+        self._automaton_phrases: tuple[str, ...] = ()
 
     def add_source(self, source: BaseSource) -> None:
         self.sources.append(source)
@@ -143,40 +220,158 @@ class MultiSourceRetriever:
             if hasattr(src, "index") and callable(getattr(src, "index")):
                 src.index()
 
+    def close(self) -> None:
+        """Shut down the worker pool used for source fan-out."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+            if pool is not None:
+                self._pool_finalizer.detach()
+                self._pool_finalizer = None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def __enter__(self) -> "MultiSourceRetriever":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        """Create the fan-out pool once, even under concurrent retrieve() calls."""
+        pool = self._pool
+        if pool is None:
+            with self._pool_lock:
+                pool = self._pool
+                if pool is None:
+                    pool = ThreadPoolExecutor(
+                        max_workers=min(self.max_workers, len(self.sources)),
+                        thread_name_prefix="hippoium-retriever",
+                    )
+                    self._pool_finalizer = weakref.finalize(self, pool.shutdown, wait=False)
+                    self._pool = pool
+        return pool
+
+    def _search_all(self, query: str) -> List[Document]:
+        """Query every source, in parallel when there is more than one.
+
+        Results are concatenated in source order so deduplication keeps
+        preferring earlier sources, exactly as the sequential loop did.
+        """
+        all_docs: List[Document] = []
+        if len(self.sources) <= 1 or self.max_workers <= 1:
+            for src in self.sources:
+                try:
+                    all_docs.extend(src.search(query))
+                except Exception:
+                    continue
+            return all_docs
+        pool = self._get_pool()
+        futures = [pool.submit(src.search, query) for src in self.sources]
+        for fut in futures:
+            try:
+                all_docs.extend(fut.result())
+            except Exception:
+                continue
+        return all_docs
+
+    def _negative_automaton(self) -> Any:
+        """Aho-Corasick automaton over ``negative_phrases``, or None.
+
+        Rebuilt only when the phrase list changes. Returns None when
+        pyahocorasick is missing, the list is short, or it contains an
+        empty phrase (which matches everything anyway).
+        """
+        phrases = tuple(self.negative_phrases)
+        if (
+            ahocorasick is None
+            or len(phrases) < _AUTOMATON_MIN_PHRASES
+            or "" in phrases
+        ):
+            return None
+        if phrases != self._automaton_phrases:
+            automaton = ahocorasick.Automaton()
+            for p in phrases:
+                automaton.add_word(p, p)
+            automaton.make_automaton()
+            self._phrase_automaton = automaton
+            self._automaton_phrases = phrases
+        return self._phrase_automaton
+
+    @staticmethod
+    def _ratio_reaches(
+        content: str, matchers: List[SequenceMatcher], threshold: float
+    ) -> bool:
+        """Whether the default ratio of ``content`` against any matcher's
+        seq2 reaches ``threshold``.
+
+        Each matcher keeps its seq2 match index across calls, so it is built
+        once per query rather than once per pair. The quick ratios are upper
+        bounds on ``ratio()``, so a miss on either is a definite miss.
+        """
+        for sm in matchers:
+            sm.set_seq1(content)
+            if (
+                sm.real_quick_ratio() >= threshold
+                and sm.quick_ratio() >= threshold
+                and sm.ratio() >= threshold
+            ):
+                return True
+        return False
+
     def _filter_negatives(self, docs: List[Document]) -> List[Document]:
         kept: List[Document] = []
+        matchers: List[SequenceMatcher] = []
+        if self._default_similarity:
+            # per call, not per instance: matchers are stateful and retrieve()
+            # may run on several threads at once
+            matchers = [SequenceMatcher(None, "", nt) for nt in self.negative_texts]
+        automaton = self._negative_automaton()
         for d in docs:
             text_lower = d.content.lower()
-            if any(p in text_lower for p in self.negative_phrases):
+            if automaton is not None:
+                # single pass over the text, stopping at the first hit
+                if next(automaton.iter(text_lower), None) is not None:
+                    continue
+            elif any(p in text_lower for p in self.negative_phrases):
                 continue
-            skip = False
-            for nt in self.negative_texts:
-                if self.similarity_func(d.content, nt) >= self.negative_threshold:
-                    skip = True
-                    break
+            if self._default_similarity:
+                skip = self._ratio_reaches(
+                    d.content, matchers, self.negative_threshold
+                )
+            else:
+                skip = any(
+                    self.similarity_func(d.content, nt) >= self.negative_threshold
+                    for nt in self.negative_texts
+                )
             if not skip:
                 kept.append(d)
         return kept
 
     def _deduplicate(self, docs: List[Document]) -> List[Document]:
         unique: List[Document] = []
+        # default ratio: one matcher per kept document, its content as seq2
+        matchers: List[SequenceMatcher] = []
+        seen: set[str] = set()
         for d in docs:
-            dup = False
-            for u in unique:
-                if self.similarity_func(d.content, u.content) >= self.dedup_threshold:
-                    dup = True
-                    break
+            # Byte-identical content is the common case; skip the fuzzy scan.
+            if d.content in seen:
+                continue
+            seen.add(d.content)
+            if self._default_similarity:
+                dup = self._ratio_reaches(d.content, matchers, self.dedup_threshold)
+            else:
+                dup = any(
+                    self.similarity_func(d.content, u.content) >= self.dedup_threshold
+                    for u in unique
+                )
             if not dup:
                 unique.append(d)
+                if self._default_similarity:
+                    matchers.append(SequenceMatcher(None, "", d.content))
         return unique
 
     def retrieve(self, query: str, top_k: int | None = None) -> List[Document]:
-        all_docs: List[Document] = []
-        for src in self.sources:
-            try:
-                all_docs.extend(src.search(query))
-            except Exception:
-                continue
+        all_docs = self._search_all(query)
         filtered = self._filter_negatives(all_docs)
         deduped = self._deduplicate(filtered)
         deduped.sort(key=lambda d: d.score or 0, reverse=True)
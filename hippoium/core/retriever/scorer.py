@@ -25,41 +25,26 @@ class HybridScorer:
         self.mode = mode
         self.embedding_client = embedding_client
 
-    def _cos_sim(self, vec1: List[float], vec2: List[float]) -> float:
-        """Return cosine similarity between two vectors."""
-        a = np.array(vec1)
-        b = np.array(vec2)
-        denom = (np.linalg.norm(a) * np.linalg.norm(b)) + 1e-8
-        if denom == 0:
-            return 0.0
-        return float(np.dot(a, b) / denom)
-
     def score(self, query: str, docs: Sequence[Message]) -> List[float]:
         """Compute hybrid scores for ``docs`` given ``query``."""
+        if not docs:
+            return []
 
-        # Obtain embeddings for the query and a simple negative query.
-        q_vec = self._embed_one(query)
+        # Embed the query, a simple negative query and every document in one
+        # backend call, then score all documents with matrix-vector products.
         neg_query = query[::-1]  # Placeholder negative example.
-        neg_vec = self._embed_one(neg_query)
-
-        scores: List[float] = []
-        for d in docs:
-            doc_vec = self._embed_one(d.content)
-
-            pos = self._cos_sim(q_vec, doc_vec)
-            neg = self._cos_sim(neg_vec, doc_vec)
-
-            if self.mode is ScoreFn.POS_COS:
-                s = pos
-            elif self.mode is ScoreFn.NEG_COS:
-                s = 1 - neg
-            else:
-                s = pos - self.beta * neg
-            scores.append(s)
-        return scores
-
-    def _embed_one(self, text: str) -> List[float]:
-        vectors = list(self.embedding_client.embed([text]))
-        if not vectors:
-            return []
-        return list(vectors[0])
+        texts = [query, neg_query, *(d.content for d in docs)]
+        vecs = np.asarray(list(self.embedding_client.embed(texts)), dtype=float)
+        q_vec, neg_vec, doc_vecs = vecs[0], vecs[1], vecs[2:]
+
+        doc_norms = np.linalg.norm(doc_vecs, axis=1)
+        pos = doc_vecs @ q_vec / (doc_norms * np.linalg.norm(q_vec) + 1e-8)
+        neg = doc_vecs @ neg_vec / (doc_norms * np.linalg.norm(neg_vec) + 1e-8)
+
+        if self.mode is ScoreFn.POS_COS:
+            scores = pos
+        elif self.mode is ScoreFn.NEG_COS:
+            scores = 1 - neg
+        else:
+            scores = pos - self.beta * neg
+        return scores.tolist()
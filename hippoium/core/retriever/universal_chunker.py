@@ -12,10 +12,12 @@ A dependency-light, strategy-pluggable chunker for Hippoium.
 from __future__ import annotations
 
 import itertools
+import os
 import re
-import uuid
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
-from functools import reduce
+from functools import lru_cache, reduce
+from threading import Lock
 from typing import Any, Dict, Iterable, List, Optional, Type
 
 # ────────────────────────────────────────────────────────────────
@@ -53,6 +55,12 @@ class ChunkConfig:
     overlap: int = 50
     lang_hint: str = "auto"             # 可強制 "zh" / "en"
     semantic_threshold: float = 0.95    # SemanticChunker 關閉時可忽略
+    embed_batch_size: int = 64          # SemanticChunker encode 批次大小
+    embed_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+    device: Optional[str] = None        # None 交由 sentence-transformers 自動選擇
+    embed_backend: str = "torch"        # torch | onnx | openvino
+    embed_model_file: Optional[str] = None  # 例如 "onnx/model_qint8_avx512.onnx"（INT8）
+    workers: int = 0                    # >1 時 RecursiveChunker 以多行程切分大文件
     custom_separators: Optional[List[str]] = None
     custom_abbr: Optional[List[str]] = None  # 供使用者擴充縮寫表
 
@@ -66,6 +74,17 @@ DEFAULT_ABBR_EN = {
     "etc.", "vs.", "inc.", "fig.", "approx."
 }
 NUMBER_DOT = re.compile(r"\b\d+\.\d+\b")  # e.g. 3.1415
+SENTENCE_SPLIT = re.compile(r"(?<=[。！？.!?])\s+")
+PROTECTED_TOKEN = re.compile(r"__DOT\d+__")
+
+
+def _compile_abbr(abbrs: Iterable[str]) -> Optional[re.Pattern[str]]:
+    """將縮寫表編成單一 alternation（長者優先），一次掃描即可全部保護。"""
+    ordered = sorted(abbrs, key=len, reverse=True)
+    if not ordered:
+        return None
+    return re.compile("|".join(re.escape(a) for a in ordered), re.IGNORECASE)
+
 
 class BaseChunker:
     def __init__(self, cfg: ChunkConfig):
@@ -73,6 +92,15 @@ class BaseChunker:
         self.abbr_set = set(DEFAULT_ABBR_EN)
         if cfg.custom_abbr:
             self.abbr_set.update(a.lower() for a in cfg.custom_abbr)
+        self._abbr_key = frozenset(self.abbr_set)
+        self._abbr_re = _compile_abbr(self._abbr_key)
+
+    def _abbr_pattern(self) -> Optional[re.Pattern[str]]:
+        # abbr_set 為公開屬性，若被修改則重新編譯
+        if self._abbr_key != self.abbr_set:
+            self._abbr_key = frozenset(self.abbr_set)
+            self._abbr_re = _compile_abbr(self._abbr_key)
+        return self._abbr_re
 
     # -------- 句子分割（考慮縮寫與小數點） --------
     def _sentences(self, text: str) -> List[str]:
@@ -86,22 +114,22 @@ class BaseChunker:
         # 保護小數
         text = NUMBER_DOT.sub(_protect, text)
 
-        # 保護縮寫
-        for abbr in self.abbr_set:
-            if abbr in text.lower():
-                escaped = re.escape(abbr)
-                text = re.sub(escaped, _protect, text, flags=re.IGNORECASE)
+        # 保護縮寫（單次掃描）
+        abbr_re = self._abbr_pattern()
+        if abbr_re is not None:
+            text = abbr_re.sub(_protect, text)
 
         # 中西方句點分割
-        parts = re.split(r"(?<=[。！？.!?])\s+", text)
+        parts = SENTENCE_SPLIT.split(text)
 
-        # 還原
-        def _restore(s: str) -> str:
-            for k, v in protected.items():
-                s = s.replace(k, v)
-            return s
+        # 還原（單一 regex 掃描，依 placeholder 查表）
+        if not protected:
+            return [p for p in parts if p.strip()]
 
-        return [ _restore(p) for p in parts if p.strip() ]
+        def _restore(m: re.Match[str]) -> str:
+            return protected.get(m.group(0), m.group(0))
+
+        return [PROTECTED_TOKEN.sub(_restore, p) for p in parts if p.strip()]
 
     # 子類需實作
     def split(self, text: str) -> Iterable[str]:  # pragma: no cover
@@ -114,34 +142,67 @@ class BaseChunker:
 
 class FixedChunker(BaseChunker):
     def split(self, text: str) -> Iterable[str]:
-        chars = list(text)                           # 以字符近似 token，避免外部 tokenizer
+        # 以字符近似 token，避免外部 tokenizer；直接切片，不展開成字元 list
         size, ov = self.cfg.chunk_size, self.cfg.overlap
-        for i in range(0, len(chars), size - ov):
-            yield "".join(chars[i:i + size])
+        step = size - ov
+        if step <= 0:
+            raise ValueError("FixedChunker 需要 chunk_size > overlap")
+        for i in range(0, len(text), step):
+            yield text[i:i + size]
+
+
+def _recursive_levels(chunks: List[str], seps: List[str], size: int) -> List[str]:
+    """依序以各 sep 切開過長的 chunk；各 chunk 彼此獨立處理。"""
+    for sep in seps:
+        new_chunks: List[str] = []
+        for chunk in chunks:
+            if len(chunk) <= size:
+                new_chunks.append(chunk)
+                continue
+            # 依 sep 再切
+            parts = chunk.split(sep)
+            buf_parts: List[str] = []
+            buf_len = 0
+            for part in parts:
+                if buf_len + len(part) <= size:
+                    buf_parts.append(part)
+                    buf_parts.append(sep)
+                    buf_len += len(part) + len(sep)
+                else:
+                    new_chunks.append("".join(buf_parts))
+                    buf_parts = [part, sep]
+                    buf_len = len(part) + len(sep)
+            if buf_len:
+                new_chunks.append("".join(buf_parts))
+        chunks = new_chunks
+    return chunks
+
+
+def _recursive_shard(args: tuple) -> List[str]:
+    # ProcessPoolExecutor 需可 pickle 的頂層函式
+    return _recursive_levels(*args)
+
+
+# 小於此長度時行程池的啟動與序列化成本高於收益
+_PARALLEL_MIN_CHARS = 1 << 20
 
 
 class RecursiveChunker(BaseChunker):
     def split(self, text: str) -> Iterable[str]:
         seps = self.cfg.custom_separators or ["\n\n", "\n", "。", ".", " ", ""]
-        chunks = [text]
-        for sep in seps:
-            new_chunks: List[str] = []
-            for chunk in chunks:
-                if len(chunk) <= self.cfg.chunk_size:
-                    new_chunks.append(chunk)
-                    continue
-                # 依 sep 再切
-                parts = chunk.split(sep)
-                buf = ""
-                for part in parts:
-                    if len(buf) + len(part) <= self.cfg.chunk_size:
-                        buf += part + sep
-                    else:
-                        new_chunks.append(buf)
-                        buf = part + sep
-                if buf:
-                    new_chunks.append(buf)
-            chunks = new_chunks
+        size, workers = self.cfg.chunk_size, self.cfg.workers
+        if workers > 1 and len(text) >= _PARALLEL_MIN_CHARS:
+            # 第一層切完後各 chunk 的後續處理互不相依：
+            # 依序分片交給子行程，結果與單行程完全相同
+            top = _recursive_levels([text], seps[:1], size)
+            step = -(-len(top) // workers)
+            jobs = [(top[i:i + step], seps[1:], size) for i in range(0, len(top), step)]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                chunks = list(itertools.chain.from_iterable(
+                    pool.map(_recursive_shard, jobs)
+                ))
+        else:
+            chunks = _recursive_levels([text], seps, size)
 
         # 處理 overlap
         ov = self.cfg.overlap
@@ -154,22 +215,43 @@ class RecursiveChunker(BaseChunker):
 class SentenceChunker(BaseChunker):
     def split(self, text: str) -> Iterable[str]:
         sentences = self._sentences(text)
-        buf = ""
+        buf_parts: List[str] = []
+        buf_len = 0
         size, ov = self.cfg.chunk_size, self.cfg.overlap
         for sent in sentences:
-            if len(buf) + len(sent) <= size:
-                buf += sent
+            if buf_len + len(sent) <= size:
+                buf_parts.append(sent)
+                buf_len += len(sent)
             else:
-                yield buf
-                buf = sent
-        if buf:
-            yield buf
+                yield "".join(buf_parts)
+                buf_parts = [sent]
+                buf_len = len(sent)
+        if buf_len:
+            yield "".join(buf_parts)
 
         # optional overlap (句子級 chunk 不太需要重疊；如需可自行開啟)
         # 實作與 Recursive 相同，這裡省略
 
 
 # -------- 4.1 SemanticChunker（可選） --------
+@lru_cache(maxsize=4)
+def _load_st(
+    model_name: str,
+    device: Optional[str] = None,
+    backend: str = "torch",
+    model_file: Optional[str] = None,
+):
+    """同一 (model, device, backend) 只載入一次，供所有 SemanticChunker 共用。"""
+    from sentence_transformers import SentenceTransformer
+    if backend == "torch":
+        return SentenceTransformer(model_name, device=device)
+    # onnx / openvino 需 sentence-transformers>=3.2 及對應 optimum 套件
+    model_kwargs = {"file_name": model_file} if model_file else None
+    return SentenceTransformer(
+        model_name, device=device, backend=backend, model_kwargs=model_kwargs
+    )
+
+
 class SemanticChunker(BaseChunker):
     """
     依照相鄰句 embedding 相似度 (cosine) 進行聚合。
@@ -185,18 +267,33 @@ class SemanticChunker(BaseChunker):
                 "SemanticChunker 需要安裝 sentence-transformers & numpy：\n"
                 "    pip install sentence-transformers numpy"
             ) from e
-        self.st_model = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
+        self.st_model = _load_st(
+            cfg.embed_model, cfg.device, cfg.embed_backend, cfg.embed_model_file
+        )
         self.np = __import__("numpy")
 
     def _embed(self, sents: List[str]):
-        return self.st_model.encode(sents, show_progress_bar=False, normalize_embeddings=True)
+        # 依長度排序後批次 encode，減少 padding；再依原順序還原
+        np = self.np
+        order = np.argsort([len(s) for s in sents], kind="stable")
+        embs = self.st_model.encode(
+            [sents[i] for i in order],
+            batch_size=self.cfg.embed_batch_size,
+            show_progress_bar=False,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+        )
+        out = np.empty_like(embs)
+        out[order] = embs
+        return out
 
     def split(self, text: str) -> Iterable[str]:
         sents = self._sentences(text)
         if not sents:
             return
-        embs = self._embed(sents)
-        np = self.np
+        embs = self.np.asarray(self._embed(sents))
+        # 相鄰句 cosine 一次算完（embedding 已 L2 normalize）
+        cos_adj = self.np.einsum("ij,ij->i", embs[:-1], embs[1:])
 
         buf, buf_len = "", 0
         size, ov, thresh = self.cfg.chunk_size, self.cfg.overlap, self.cfg.semantic_threshold
@@ -208,10 +305,7 @@ class SemanticChunker(BaseChunker):
                 continue
 
             # 若已達 chunk_size，上下句再判 cosine
-            if i + 1 < len(embs):
-                cos = float(np.dot(embs[i], embs[i + 1]))
-            else:
-                cos = 0.0
+            cos = float(cos_adj[i]) if i < len(cos_adj) else 0.0
             if cos < thresh or buf_len >= size:
                 yield buf
                 # overlap by chars
@@ -251,13 +345,44 @@ def get_strategy(name: str) -> Type[BaseChunker]:
 # 6. Graph Builder
 # ────────────────────────────────────────────────────────────────
 
+_UID_BYTES = 16
+_UID_POOL_BYTES = _UID_BYTES * 256
+# 跨呼叫共用的熵池：短文件（只有幾個 chunk）也不必每次讀滿 4 KiB
+_uid_lock = Lock()
+_uid_pool = b""
+_uid_pos = 0
+
+
+def _reset_uid_pool() -> None:
+    # fork 後子行程不可沿用父行程剩餘的熵，否則兩邊會產生相同 uid
+    global _uid_lock, _uid_pool, _uid_pos
+    _uid_lock = Lock()
+    _uid_pool, _uid_pos = b"", 0
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_uid_pool)
+
+
+def _next_uid() -> str:
+    """隨機 128-bit hex uid；從共用熵池切片，攤平 os.urandom 的 syscall 成本。"""
+    global _uid_pool, _uid_pos
+    with _uid_lock:
+        pos = _uid_pos
+        if pos >= len(_uid_pool):
+            _uid_pool, pos = os.urandom(_UID_POOL_BYTES), 0
+        _uid_pos = pos + _UID_BYTES
+        raw = _uid_pool[pos:pos + _UID_BYTES]
+    return raw.hex()
+
+
 def build_graph(chunks_iter: Iterable[str],
                 parent_id: str,
                 chunk_type: str = "text") -> DocGraph:
     graph = DocGraph(parent_id=parent_id, nodes={})
     prev_uid: Optional[str] = None
     for content in chunks_iter:
-        uid = str(uuid.uuid4())
+        uid = _next_uid()
         node = Chunk(uid=uid,
                      parent_id=parent_id,
                      prev_id=prev_uid,
@@ -281,16 +406,28 @@ _BLOCK_PATTERNS = {
     "table": re.compile(r"(\|.+?\|(?:\s*\n\|.+?\|)+)"),        # markdown table
     "formula": re.compile(r"\$\$.*?\$\$", re.S),
 }
+_BLOCK_PREFIX = {btype: f"__{btype.upper()}_" for btype in _BLOCK_PATTERNS}
 
 def extract_blocks(text: str) -> Dict[str, List[str]]:
     """回傳 {block_type: [block_str, ...]}，並在原文中用 placeholder 取代"""
     placeholders, counter = {}, 0
+    # 依 pattern 優先序逐一在「已替換」的文字上比對，後面的 block（如表格）
+    # 可包住前面 block 的 placeholder；每個 pattern 只以切片重組一次，
+    # 避免每個 match 都整段 text.replace。
     for btype, pat in _BLOCK_PATTERNS.items():
+        prefix = _BLOCK_PREFIX[btype]
+        parts: List[str] = []
+        pos = 0
         for match in pat.finditer(text):
-            key = f"__{btype.upper()}_{counter}__"
+            key = prefix + str(counter) + "__"
             placeholders[key] = (btype, match.group(0))
-            text = text.replace(match.group(0), f" {key} ")
+            parts.append(text[pos:match.start()])
+            parts.append(" " + key + " ")
+            pos = match.end()
             counter += 1
+        if parts:
+            parts.append(text[pos:])
+            text = "".join(parts)
     return placeholders, text
 
 
@@ -2,16 +2,47 @@
 Route request to llm provider based on cost/latency score.
 """
 from __future__ import annotations
-from typing import Dict
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import Dict, Tuple
 import random
 
 from hippoium.ports.protocols import LLMClient
 
+RouteKey = Tuple[int, bytes, bytes]
+
+
+def _route_key(prompt: str) -> RouteKey:
+    """Cheap prompt fingerprint: length bucket + head/tail digests."""
+    head = blake2b(prompt[:64].encode("utf-8"), digest_size=8).digest()
+    tail = blake2b(prompt[-64:].encode("utf-8"), digest_size=8).digest()
+    return len(prompt) >> 6, head, tail
+
 
 class CostRouter:
-    def __init__(self, providers: Dict[str, LLMClient]):
+    def __init__(self, providers: Dict[str, LLMClient], memo_size: int = 4096):
         self.providers = providers
+        self.memo_size = memo_size
+        self._memo: OrderedDict[RouteKey, str] = OrderedDict()
+        self._memo_names: Tuple[str, ...] = tuple(providers)
 
-    def select(self, prompt: str) -> LLMClient:
+    def _score(self, prompt: str) -> str:
         # TODO: real cost & latency model
-        return random.choice(list(self.providers.values()))
+        return random.choice(list(self.providers))
+
+    def select(self, prompt: str) -> LLMClient:
+        names = tuple(self.providers)
+        if names != self._memo_names:
+            # provider set changed; cached decisions may point at stale names
+            self._memo.clear()
+            self._memo_names = names
+        key = _route_key(prompt)
+        name = self._memo.get(key)
+        if name is None:
+            name = self._score(prompt)
+            self._memo[key] = name
+            if len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+        else:
+            self._memo.move_to_end(key)
+        return self.providers[name]
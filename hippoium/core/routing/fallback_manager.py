@@ -5,18 +5,32 @@ from __future__ import annotations
 import logging
 
 from hippoium.ports.protocols import LLMClient
+from hippoium.core.routing.semantic_cache import SemanticCache
 
 logger = logging.getLogger("hippoium.fallback")
 
 
 class FallbackManager:
-    def __init__(self, primary: LLMClient, secondary: LLMClient):
+    def __init__(
+        self,
+        primary: LLMClient,
+        secondary: LLMClient,
+        cache: SemanticCache | None = None,
+    ):
         self.primary = primary
         self.secondary = secondary
+        self.cache = cache
 
     def execute(self, prompt: str) -> str:
+        if self.cache is not None:
+            hit = self.cache.get(prompt)
+            if hit is not None:
+                return hit
         try:
-            return self.primary.complete(prompt)
+            response = self.primary.complete(prompt)
         except Exception as e:
             logger.warning("Primary failed: %s; falling back", e)
-            return self.secondary.complete(prompt)
+            response = self.secondary.complete(prompt)
+        if self.cache is not None:
+            self.cache.put(prompt, response)
+        return response
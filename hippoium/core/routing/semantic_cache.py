@@ -0,0 +1,122 @@
+"""
+SemanticCache – prompt-level response cache keyed by embedding similarity.
+"""
+from __future__ import annotations
+from collections import OrderedDict
+from threading import RLock
+from typing import Callable, Sequence
+import time
+
+import numpy as np
+
+EmbedFn = Callable[[str], Sequence[float]]
+
+
+class SemanticCache:
+    """Cosine-similarity cache with LRU eviction and TTL.
+
+    Embeddings are L2-normalised and stacked in one matrix, so a lookup is a
+    single matrix-vector product (equivalent to a flat inner-product index).
+    """
+
+    def __init__(
+        self,
+        embed_fn: EmbedFn,
+        threshold: float = 0.87,
+        dup_threshold: float = 0.95,
+        max_entries: int = 1024,
+        ttl: float | None = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        self.embed_fn = embed_fn
+        self.threshold = threshold
+        self.dup_threshold = dup_threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._vecs: np.ndarray | None = None
+        self._responses: list[str] = []
+        self._stamps: list[float] = []
+        # slot -> None, ordered from least to most recently used
+        self._lru: OrderedDict[int, None] = OrderedDict()
+        self._free: list[int] = []
+        self._lock = RLock()
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    def _embed(self, prompt: str) -> np.ndarray:
+        vec = np.asarray(self.embed_fn(prompt), dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm else vec
+
+    def _top1(self, vec: np.ndarray) -> tuple[int, float]:
+        if not self._lru:
+            return -1, 0.0
+        sims = self._vecs @ vec
+        if self._free:
+            sims[self._free] = -np.inf
+        idx = int(np.argmax(sims))
+        return idx, float(sims[idx])
+
+    def _drop(self, slot: int) -> None:
+        self._lru.pop(slot, None)
+        self._responses[slot] = ""
+        self._free.append(slot)
+
+    def _drop_expired(self, now: float) -> None:
+        # drop every expired entry before ranking, so a stale best match
+        # cannot hide a live one that also clears the threshold
+        if self.ttl is None or not self._lru:
+            return
+        stamps = np.asarray(self._stamps)
+        for slot in np.flatnonzero(now - stamps > self.ttl).tolist():
+            if slot in self._lru:
+                self._drop(slot)
+
+    def get(self, prompt: str) -> str | None:
+        vec = self._embed(prompt)
+        with self._lock:
+            self._drop_expired(self.clock())
+            slot, sim = self._top1(vec)
+            if slot < 0 or sim < self.threshold:
+                return None
+            self._lru.move_to_end(slot)
+            return self._responses[slot]
+
+    def put(self, prompt: str, response: str) -> None:
+        vec = self._embed(prompt)
+        now = self.clock()
+        with self._lock:
+            slot, sim = self._top1(vec)
+            if slot >= 0 and sim > self.dup_threshold:
+                # near-identical prompt: refresh in place
+                self._responses[slot] = response
+                self._stamps[slot] = now
+                self._lru.move_to_end(slot)
+                return
+            while self._lru and len(self._lru) >= self.max_entries:
+                oldest, _ = self._lru.popitem(last=False)
+                self._drop(oldest)
+            if self._free:
+                slot = self._free.pop()
+                self._vecs[slot] = vec
+                self._responses[slot] = response
+                self._stamps[slot] = now
+            else:
+                slot = len(self._responses)
+                row = vec[None, :]
+                self._vecs = row if self._vecs is None else np.vstack([self._vecs, row])
+                self._responses.append(response)
+                self._stamps.append(now)
+            self._lru[slot] = None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._vecs = None
+            self._responses.clear()
+            self._stamps.clear()
+            self._lru.clear()
+            self._free.clear()
@@ -3,9 +3,15 @@ LoRATrainer – kick off LoRA fine-tuning (placeholder).
 """
 from __future__ import annotations
 from pathlib import Path
-from typing import List, Tuple
+from typing import Iterable, List, Tuple
 from hippoium.core.training.pair_builder import PairBuilder
-import json
+from hippoium.core.utils.serializer import to_json_bytes
+
+_FLUSH_BYTES = 1 << 20
+
+
+def _dump_line(record: dict) -> bytes:
+    return to_json_bytes(record) + b"\n"
 
 
 class LoRATrainer:
@@ -13,34 +19,22 @@ class LoRATrainer:
         self.out = Path(output_dir)
         self.out.mkdir(exist_ok=True)
 
-    def prepare_dataset(self, pairs: List[Tuple[str, str]], shard: str = "train"):
+    def prepare_dataset(self, pairs: Iterable[Tuple[str, str]], shard: str = "train"):
         path = self.out / f"{shard}.jsonl"
-        with path.open("w", encoding="utf-8") as fp:
+        chunks: List[bytes] = []
+        size = 0
+        with path.open("wb") as fp:
             for p, c in pairs:
-                fp.write(json.dumps({"prompt": p, "completion": c}, ensure_ascii=False) + "\n")
+                line = _dump_line({"prompt": p, "completion": c})
+                chunks.append(line)
+                size += len(line)
+                if size >= _FLUSH_BYTES:
+                    fp.write(b"".join(chunks))
+                    chunks.clear()
+                    size = 0
+            if chunks:
+                fp.write(b"".join(chunks))
 
     def train(self):
         # TODO: integrate with PEFT / Hugging Face LoRA pipeline
         print("LoRA fine-tuning stub – dataset ready at", self.out)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
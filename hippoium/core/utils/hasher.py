@@ -1,18 +1,106 @@
 import hashlib
-from collections.abc import Iterable
+from collections import deque
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+
+_MERSENNE_61 = (1 << 61) - 1
+# hashlib releases the GIL above ~2 KiB, so threads only pay off for big batches
+# (measured in characters: the texts are not encoded just to size the batch).
+_PARALLEL_MIN_CHARS = 1 << 20
 
 
 def hash_text(text: str) -> str:
-    """Return SHA-1 hash of given text."""
-    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+    """Return BLAKE2b (160-bit) hash of given text.
+
+    Used for dedupe/identity, not security; BLAKE2b is faster than SHA-1/256
+    in CPython and keeps the familiar 40-char hex digest length.
+    """
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=20).hexdigest()
 
 
 def hash_text_sha256(text: str) -> str:
-    """Return SHA-256 hash of given text."""
+    """Return SHA-256 hash of given text (for callers needing interop)."""
     return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
 
+def hash_texts_sha256(texts: Sequence[str], max_workers: int = 4) -> list[str]:
+    """SHA-256 a batch of texts, hashing in threads when the batch is large."""
+    if max_workers > 1 and len(texts) > 1:
+        total = sum(len(t) for t in texts)
+        if total >= _PARALLEL_MIN_CHARS:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                return list(pool.map(hash_text_sha256, texts))
+    return list(map(hash_text_sha256, texts))
+
+
+def _token_hash(token: str, mod: int) -> int:
+    digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % mod
+
+
+class RollingHasher:
+    """Polynomial (Rabin–Karp) rolling hash over a token window.
+
+    ``extend`` appends a token and ``shift`` slides a full window by one
+    token; both are O(1) regardless of window size.
+    """
+
+    def __init__(
+        self,
+        window: int | None = None,
+        base: int = 1000003,
+        mod: int = _MERSENNE_61,
+    ) -> None:
+        self.window = window
+        self.base = base
+        self.mod = mod
+        # weight of the oldest token in a full window: base ** (window - 1)
+        self._pow = pow(base, window - 1, mod) if window else 0
+        self._h = 0
+
+    @property
+    def value(self) -> int:
+        return self._h
+
+    def hexdigest(self) -> str:
+        return f"{self._h:016x}"
+
+    def reset(self) -> None:
+        self._h = 0
+
+    def extend(self, token: str) -> int:
+        self._h = (self._h * self.base + _token_hash(token, self.mod)) % self.mod
+        return self._h
+
+    def shift(self, new_token: str, old_token: str) -> int:
+        if not self.window:
+            raise ValueError("shift() requires a fixed window size")
+        h = (self._h - _token_hash(old_token, self.mod) * self._pow) % self.mod
+        self._h = (h * self.base + _token_hash(new_token, self.mod)) % self.mod
+        return self._h
+
+
 def rolling_hash(tokens: Iterable[str]) -> str:
     """Very light rolling hash (for sliding window dedupe)."""
-    # TODO: optimised rolling hash; placeholder concat-hash for now
-    return hash_text("".join(tokens))
+    hasher = RollingHasher()
+    for t in tokens:
+        hasher.extend(t)
+    return hasher.hexdigest()
+
+
+def window_hashes(tokens: Iterable[str], window: int) -> Iterator[int]:
+    """Yield the rolling hash of every full ``window``-token window in order."""
+    if window <= 0:
+        raise ValueError("window must be positive")
+    hasher = RollingHasher(window)
+    buf: deque[str] = deque()
+    for t in tokens:
+        if len(buf) < window:
+            buf.append(t)
+            hasher.extend(t)
+            if len(buf) == window:
+                yield hasher.value
+            continue
+        hasher.shift(t, buf.popleft())
+        buf.append(t)
+        yield hasher.value
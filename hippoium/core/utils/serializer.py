@@ -2,6 +2,18 @@ import json
 import pickle
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None
+
+# datetimes and dataclasses go through ``default=str`` like ``to_json``
+_ORJSON_OPTIONS = (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+    if orjson is not None
+    else 0
+)
+
 
 def to_json(data: Any) -> str:
     return json.dumps(data, ensure_ascii=False, default=str)
@@ -11,6 +23,25 @@ def from_json(payload: str) -> Any:
     return json.loads(payload)
 
 
+def to_json_bytes(data: Any) -> bytes:
+    """UTF-8 encoded ``to_json``; uses orjson when installed.
+
+    Payloads orjson rejects (e.g. non-str dict keys) fall back to ``to_json``.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, default=str, option=_ORJSON_OPTIONS)
+        except TypeError:
+            pass
+    return to_json(data).encode("utf-8")
+
+
+def from_json_bytes(payload: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
 def to_pickle(data: Any) -> bytes:
     return pickle.dumps(data)
 
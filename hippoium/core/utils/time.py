@@ -1,7 +1,26 @@
 from __future__ import annotations
 
+import time
 from datetime import datetime, timezone
 
+_TICK_NS = 1_000_000  # cached_utc_now 的刷新間隔（1 ms）
+_last_ns = 0
+_last_dt: datetime | None = None
+
 
 def utc_now() -> datetime:
     return datetime.now(timezone.utc)
+
+
+def cached_utc_now() -> datetime:
+    """UTC now with millisecond granularity; reuses one datetime per tick.
+
+    Meant for default timestamps that are usually overwritten by payload
+    data, where building a fresh ``datetime`` per record is wasted work.
+    """
+    global _last_ns, _last_dt
+    ns = time.monotonic_ns()
+    if _last_dt is None or ns - _last_ns > _TICK_NS:
+        _last_ns = ns
+        _last_dt = datetime.now(timezone.utc)
+    return _last_dt
@@ -1,12 +1,22 @@
 import re
+from functools import lru_cache
 from typing import Sequence
 from hippoium.ports.port_types import TokenCount
 
 _TOKENIZER_RE = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+# Longer texts are counted directly so the cache never pins large strings.
+_CACHE_MAX_CHARS = 4096
+
+
+@lru_cache(maxsize=4096)
+def _count_cached(text: str) -> int:
+    return len(_TOKENIZER_RE.findall(text))
 
 
 def count_tokens(text: str | Sequence[str]) -> TokenCount:
     """Rough heuristic token counter (word + punctuation)."""
     if isinstance(text, str):
+        if len(text) <= _CACHE_MAX_CHARS:
+            return _count_cached(text)
         return len(_TOKENIZER_RE.findall(text))
     return sum(count_tokens(t) for t in text)  # type: ignore[recursion]
@@ -1,15 +1,46 @@
+import itertools
+from collections import deque
 from datetime import timedelta
-from typing import Optional
+from typing import BinaryIO, Iterable, Iterator, Optional
 
 from hippoium.core.cer.compressor import Compressor
 
 # assuming stores.py defines SCache, MBuffer, LVector
 from hippoium.core.memory import stores
 from hippoium.core.memory.stores import build_namespaced_key
-from hippoium.core.utils.hasher import hash_text_sha256
+from hippoium.core.utils.hasher import hash_texts_sha256
+from hippoium.core.utils.serializer import to_json_bytes
 from hippoium.ports.domain import MemoryItem
+from hippoium.ports.port_types import MsgLabel
 from hippoium.ports.protocols import ContextEngineProtocol
 
+# Status labels stored in metadata. Enum member names are interned, so set
+# lookups and comparisons against them hit CPython's identity fast path.
+STATUS_OK = MsgLabel.OK.name
+STATUS_WARN = MsgLabel.WARN.name
+STATUS_ERR = MsgLabel.ERR.name
+
+# Status keywords, checked in priority order (WARN before ERR). Plain substring
+# tests on the lowered text run in C and beat a combined regex scan here.
+_WARN_PHRASES = ("sorry", "cannot", "unable to")
+_ERR_PHRASES = ("error", "exception", "traceback")
+
+
+def _scan_status(content: str) -> str:
+    text = content.lower()
+    if any(phrase in text for phrase in _WARN_PHRASES):
+        # Likely a refusal or safe-completion
+        return STATUS_WARN
+    if any(phrase in text for phrase in _ERR_PHRASES):
+        # Contains an error message or stack trace
+        return STATUS_ERR
+    return STATUS_OK
+
+
+def _history_tokens(history) -> int:
+    """Rough token estimate (~4 chars/token) of a stored session history."""
+    return sum(len(item.content) for item in history) // 4
+
 
 class DefaultContextEngine(ContextEngineProtocol):
     """
@@ -23,28 +54,40 @@ class DefaultContextEngine(ContextEngineProtocol):
         session_ttl: Optional[timedelta] = timedelta(minutes=30),
         compression_debug: bool = False,
         compression_preview_chars: int = 80,
+        max_session_turns: Optional[int] = 200,
+        max_sessions: Optional[int] = None,
+        tlru_threshold_tokens: int = 1024,
+        max_user_items: Optional[int] = 256,
     ):
         # S-tier: session cache (stores entire conversation history by session ID)
-        self.s_cache = stores.SCache(ttl=session_ttl)
+        # Each history is a bounded deque, mutated in place on every turn.
+        # When full, short sessions (cheap to rebuild) are evicted first.
+        self.s_cache = stores.SCache(
+            capacity=max_sessions,
+            ttl=session_ttl,
+            weigher=_history_tokens,
+            tlru_threshold=tlru_threshold_tokens,
+        )
+        self.max_session_turns = max_session_turns
+        # Monotonic turn sequence for M-tier keys (deque length saturates)
+        self._turn_seq = itertools.count(1)
         # M-tier: short-term buffer (recent messages with limits)
         self.m_buffer = stores.MBuffer(max_messages=max_messages, max_tokens=max_tokens)
         # L-tier: long-term vector store (archive or knowledge base)
         self.l_vector = stores.LVector(capacity=None)
+        self.max_user_items = max_user_items
         # Track current session ID for context (could be conversation ID or user ID)
         self.current_session: Optional[str] = None
         self.compression_debug = compression_debug
         self.compression_preview_chars = compression_preview_chars
 
-    def write_turn(
+    def _label_turn(
         self,
         role: str,
         content: str,
-        metadata: Optional[dict] = None,
-    ) -> None:
-        """
-        Record a conversation turn (with role and content). Stores in S, M, L tiers
-        and annotates status.
-        """
+        metadata: Optional[dict],
+    ) -> tuple[str, MemoryItem, dict]:
+        """Annotate one turn; returns (session_id, MemoryItem, metadata)."""
         if metadata is None:
             metadata = {}
         # Determine session (conversation) ID from metadata or use a default
@@ -61,26 +104,63 @@ class DefaultContextEngine(ContextEngineProtocol):
             content=content,
             metadata=dict(metadata),
         )  # use copy of metadata
-        # Store in session cache (S-tier) as part of conversation history list
-        history = self.s_cache.get(session_id) or []
-        history.append(mem_item)
-        self.s_cache.put(session_id, history)
+        return session_id, mem_item, metadata
 
+    def _buffer_turn(self, session_id: str, content: str) -> None:
         # Store in short-term buffer (M-tier) for immediate context (as plain text)
         # Use a namespaced key to preserve order without collisions
-        key = build_namespaced_key(session_id, str(len(history)))
+        key = build_namespaced_key(session_id, str(next(self._turn_seq)))
         # MBuffer will evict old entries if over capacity.
         self.m_buffer.put(key, content)
 
+    def write_turn(
+        self,
+        role: str,
+        content: str,
+        metadata: Optional[dict] = None,
+    ) -> None:
+        """
+        Record a conversation turn (with role and content). Stores in S, M, L tiers
+        and annotates status.
+        """
+        session_id, mem_item, metadata = self._label_turn(role, content, metadata)
+        # Store in session cache (S-tier) as part of conversation history deque
+        self.s_cache.append(session_id, mem_item, maxlen=self.max_session_turns)
+
+        self._buffer_turn(session_id, content)
+
         # (Optional) Store in long-term vector (L-tier) for archival or retrieval.
         # For example, store user messages under a user-specific key for long-term
         # memory.
         if "user_id" in metadata:
             user_key = build_namespaced_key("user", str(metadata["user_id"]))
-            self.l_vector.put(user_key, mem_item)
+            self.l_vector.append(user_key, mem_item, max_per_key=self.max_user_items)
         # Could also store all turns in LVector if long-term archival is desired:
         # self.l_vector.put(f"turn:{session_id}-{len(history)}", mem_item)
 
+    def write_turns_batch(
+        self,
+        turns: Iterable[tuple[str, str, Optional[dict]]],
+    ) -> None:
+        """
+        Record several (role, content, metadata) turns. Each turn is labelled
+        once and buffered in order; then each session's history and each user's
+        long-term entry is extended with one store call, not one per turn.
+        """
+        sessions: dict[str, list[MemoryItem]] = {}
+        users: dict[str, list[MemoryItem]] = {}
+        for role, content, metadata in turns:
+            session_id, mem_item, metadata = self._label_turn(role, content, metadata)
+            sessions.setdefault(session_id, []).append(mem_item)
+            self._buffer_turn(session_id, content)
+            if "user_id" in metadata:
+                user_key = build_namespaced_key("user", str(metadata["user_id"]))
+                users.setdefault(user_key, []).append(mem_item)
+        for session_id, items in sessions.items():
+            self.s_cache.extend(session_id, items, maxlen=self.max_session_turns)
+        for user_key, items in users.items():
+            self.l_vector.extend(user_key, items, max_per_key=self.max_user_items)
+
     def get_context_for_scope(
         self,
         scope: str,
@@ -98,19 +178,24 @@ class DefaultContextEngine(ContextEngineProtocol):
             # For task scope, use conversation history from SCache by conversation
             # (session) ID.
             conv_id = key or self.current_session or "default"
-            history: list[MemoryItem] = self.s_cache.get(conv_id) or []
+            history: deque[MemoryItem] = self.s_cache.get(conv_id) or deque()
             # Apply filters: exclude ERR/WARN if requested
-            filtered_history = [
-                item for item in history
-                if not (
-                    filters.get("exclude_err")
-                    and item.metadata.get("status") == "ERR"
-                )
-                and not (
-                    filters.get("exclude_warn")
-                    and item.metadata.get("status") == "WARN"
+            blocked = {
+                status
+                for status, flag in (
+                    (STATUS_ERR, filters.get("exclude_err")),
+                    (STATUS_WARN, filters.get("exclude_warn")),
                 )
-            ]
+                if flag
+            }
+            if blocked:
+                filtered_history = [
+                    item for item in history
+                    if item.metadata.get("status") not in blocked
+                ]
+            else:
+                # snapshot: the stored deque keeps growing in place
+                filtered_history = list(history)
             # Apply compression to the filtered history
             compressed_history = self._compress_history(filtered_history)
             result = compressed_history
@@ -119,10 +204,11 @@ class DefaultContextEngine(ContextEngineProtocol):
             if key:
                 user_items = self.l_vector.get(build_namespaced_key("user", str(key)))
                 if user_items:
-                    # If stored as a single MemoryItem or list, normalize to list
+                    # Stored as a bounded deque (or a single MemoryItem); normalize
+                    # to a list snapshot
                     result = (
-                        user_items
-                        if isinstance(user_items, list)
+                        list(user_items)
+                        if isinstance(user_items, (list, deque))
                         else [user_items]
                     )
         elif scope == "topic":
@@ -132,52 +218,56 @@ class DefaultContextEngine(ContextEngineProtocol):
             result = []
         else:
             # default: return recent short-term context from MBuffer (last N messages)
-            with self.m_buffer._lock:
-                result_texts: list[str] = [
-                    entry["value"] for entry in self.m_buffer.data.values()
-                ]
+            result_texts = self.m_buffer.values()
             # Convert to MemoryItem list (with unknown roles, assume user/assistant
             # alternation if needed).
             result = [MemoryItem(content=txt, metadata={}) for txt in result_texts]
 
         return result
 
-    def dump_memory(self) -> list[dict]:
+    def iter_memory(self) -> Iterator[dict]:
         """
-        Export the entire memory content for debugging.
-        Returns a list of dicts for each session in SCache with their messages.
+        Lazily export memory for debugging, one session dict at a time.
+        Only the session currently being yielded is materialized.
         """
-        all_sessions = []
         with self.s_cache._lock:
-            sessions = list(self.s_cache.data.items())
-        for sess_id, history in sessions:
+            sess_ids = list(self.s_cache.data)
+        for sess_id in sess_ids:
+            with self.s_cache._lock:
+                entry = self.s_cache.data.get(sess_id)
+                # SCache stores {"value": ..., "ts": ...}; snapshot the deque
+                history = list(entry["value"]) if entry else None
+            if history is None:
+                continue
             # Each history entry is MemoryItem; convert to dict for clarity
-            sess_dump = {
+            yield {
                 "session_id": sess_id,
                 "turns": [
                     {"role": item.metadata.get("role"),
                      "content": item.content,
                      "status": item.metadata.get("status")}
-                    for item in history["value"]
-                    # SCache stores {"value": ..., "ts": ...}
+                    for item in history
                 ]
             }
-            all_sessions.append(sess_dump)
-        return all_sessions
+
+    def dump_memory(self) -> list[dict]:
+        """
+        Export the entire memory content for debugging.
+        Returns a list of dicts for each session in SCache with their messages.
+        """
+        return list(self.iter_memory())
+
+    def dump_memory_json(self, fp: BinaryIO) -> None:
+        """Stream the memory dump to a binary file as JSON lines."""
+        for sess_dump in self.iter_memory():
+            fp.write(to_json_bytes(sess_dump) + b"\n")
 
     def _annotate_status(self, role: str, content: str) -> str:
         """Heuristically determine status of a message: OK, WARN, or ERR."""
         if role.lower() == "assistant":
-            text = content.lower()
-            if any(phrase in text for phrase in ["sorry", "cannot", "unable to"]):
-                # Likely a refusal or safe-completion
-                return "WARN"
-            if "error" in text or "exception" in text or "traceback" in text:
-                # Contains an error message or stack trace
-                return "ERR"
-            return "OK"
+            return _scan_status(content)
         # For user or other roles, we generally mark as OK (assuming input is valid)
-        return "OK"
+        return STATUS_OK
 
     def _compress_history(self, history: list[MemoryItem]) -> list[MemoryItem]:
         """利用 Compressor 模組進行 Hash 去重與 Diff-Patch 壓縮。"""
@@ -189,26 +279,27 @@ class DefaultContextEngine(ContextEngineProtocol):
         texts = [item.content for item in history]
         compressor = Compressor()
         compressed_texts = compressor.compress(texts)
+        hashes = hash_texts_sha256(texts)
+        method = {
+            "dedup": compressor.dedup_strategy.name.lower(),
+            "trim": compressor.trim_policy.name.lower(),
+        }
+        preview = self.compression_preview_chars
         compressed_items: list[MemoryItem] = []
-        for item, new_text in zip(history, compressed_texts):
-            new_meta = dict(item.metadata or {})
+        for item, new_text, original_hash in zip(history, compressed_texts, hashes):
             original_text = item.content
-            original_hash = hash_text_sha256(original_text)
-            new_meta["compressed"] = True
-            new_meta["compression_method"] = {
-                "dedup": compressor.dedup_strategy.name.lower(),
-                "trim": compressor.trim_policy.name.lower(),
-            }
-            new_meta["compression_ref"] = {
-                "sha256": original_hash,
-                "length": len(original_text),
-                "stored_in": "S-Cache",
-            }
-            new_meta["compression_result"] = {
-                "length": len(new_text),
+            new_meta = {
+                **(item.metadata or {}),
+                "compressed": True,
+                "compression_method": dict(method),
+                "compression_ref": {
+                    "sha256": original_hash,
+                    "length": len(original_text),
+                    "stored_in": "S-Cache",
+                },
+                "compression_result": {"length": len(new_text)},
             }
             if self.compression_debug:
-                preview = self.compression_preview_chars
                 new_meta["compression_debug"] = {
                     "original_preview": original_text[:preview],
                     "compressed_preview": new_text[:preview],
@@ -219,11 +310,29 @@ class DefaultContextEngine(ContextEngineProtocol):
 # Helper function for compression: find common overlap between end of text1
 # and start of text2.
 def _common_overlap(text1: str, text2: str) -> str:
-    max_overlap = ""
     min_len = min(len(text1), len(text2))
-    # Check suffix of text1 against prefix of text2 for largest overlap
-    for length in range(min_len, 0, -1):
-        if text1.endswith(text2[:length]):
-            max_overlap = text2[:length]
-            break
-    return max_overlap
+    if not min_len:
+        return ""
+    # any overlap must start at an occurrence of text2[0] in text1's tail;
+    # C-level find rules out the common disjoint case before the Python loops
+    if text1.find(text2[0], len(text1) - min_len) == -1:
+        return ""
+    # KMP: failure function of the candidate prefix, then stream the suffix
+    # window of text1 through it. The final match state is the overlap length.
+    pattern = text2[:min_len]
+    fail = [0] * min_len
+    j = 0
+    for i in range(1, min_len):
+        ch = pattern[i]
+        while j and ch != pattern[j]:
+            j = fail[j - 1]
+        if ch == pattern[j]:
+            j += 1
+        fail[i] = j
+    j = 0
+    for ch in text1[-min_len:]:
+        while j and ch != pattern[j]:
+            j = fail[j - 1]
+        if ch == pattern[j]:
+            j += 1
+    return pattern[:j]
@@ -38,5 +38,13 @@ class AuthError(ProviderError):
     pass
 
 
+# Built once so each policy check is a single isinstance() over the tuple.
+RETRYABLE_ERRORS: tuple[type[ProviderError], ...] = (
+    RateLimitError,
+    TimeoutError,
+    TransientServerError,
+)
+
+
 def is_retryable_error(error: BaseException) -> bool:
-    return isinstance(error, (RateLimitError, TimeoutError, TransientServerError))
+    return isinstance(error, RETRYABLE_ERRORS)
@@ -1,12 +1,35 @@
 # integrations/mcp_bridge.py
-from hippoium.ports import ContextEngineProtocol
-from hippoium.core.builder import PromptBuilder
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+
+from hippoium.ports.protocols import ContextEngineProtocol
+from hippoium.core.builder.prompt_builder import PromptBuilder
 from mcp_sdk import ContextRecord, ContextQuery, ContextBundle
 
+logger = logging.getLogger(__name__)
+
+# 背景寫入每批最多合併的紀錄數
+WRITE_BATCH_SIZE = 64
+
+
 class MCPBridge:
-    def __init__(self, engine: ContextEngineProtocol):
+    def __init__(self, engine: ContextEngineProtocol, builder: PromptBuilder | None = None):
         self.engine = engine
-        self.builder = PromptBuilder()
+        self._builder = builder
+        self._queue: asyncio.Queue | None = None
+        self._drainer: asyncio.Task | None = None
+        # 背景寫入失敗的第一個例外，於 flush() 時重新拋出
+        self._write_error: BaseException | None = None
+
+    @property
+    def builder(self) -> PromptBuilder:
+        # 延遲建立：只寫入 context 的 bridge 不需要 PromptBuilder
+        if self._builder is None:
+            self._builder = PromptBuilder()
+        return self._builder
 
     # 1️⃣ 寫入
     def record_context(self, record: ContextRecord):
@@ -16,6 +39,58 @@ class MCPBridge:
             metadata=record.meta,
         )
 
+    # 1️⃣-b 非同步寫入：排入佇列，由背景 task 批次寫入 engine
+    async def arecord_context(self, record: ContextRecord) -> None:
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._drainer is None or self._drainer.done():
+            self._drainer = asyncio.create_task(self._drain())
+        await self._queue.put(record)
+
+    async def _drain(self) -> None:
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < WRITE_BATCH_SIZE and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                # engine 寫入為同步呼叫，移到 worker thread 以免阻塞 event loop
+                await asyncio.to_thread(self._write_batch, batch)
+            except Exception as exc:  # noqa: BLE001 - 保留給 flush() 回報
+                logger.exception("MCPBridge failed to write %d context records", len(batch))
+                if self._write_error is None:
+                    self._write_error = exc
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    def _write_batch(self, batch: list[ContextRecord]) -> None:
+        turns = [(r.role, r.content, r.meta) for r in batch]
+        write_many = getattr(self.engine, "write_turns_batch", None)
+        if write_many is not None:
+            write_many(turns)
+            return
+        for role, content, meta in turns:
+            self.engine.write_turn(role=role, content=content, metadata=meta)
+
+    async def flush(self) -> None:
+        """等待佇列中所有紀錄寫入完成；背景寫入曾失敗時重新拋出該例外。"""
+        if self._queue is not None:
+            await self._queue.join()
+        error, self._write_error = self._write_error, None
+        if error is not None:
+            raise error
+
+    async def aclose(self) -> None:
+        try:
+            await self.flush()
+        finally:
+            drainer, self._drainer = self._drainer, None
+            if drainer is not None:
+                drainer.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await drainer
+
     # 2️⃣ 讀取
     def query_context(self, query: ContextQuery) -> ContextBundle:
         # scope 可能是 "user" / "task" / "topic"
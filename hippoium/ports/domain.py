@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from hippoium.core.utils.time import utc_now
 
-@dataclass
+# Hot per-turn records use __slots__ where dataclasses support it (3.10+).
+_SLOTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class Message:
     role: str
     content: str
@@ -17,7 +22,7 @@ class Message:
             self.metadata = {}
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class MemoryItem:
     content: str
     metadata: Dict[str, Any] = field(default_factory=dict)
@@ -20,16 +20,19 @@ __all__ = [
     "TokenCount","ContextQuery","ContextBundle","DocGraph","Chunk","GraphEdge"
 ,"ChatTurn","EdgeType","Artifact","Message","RetrievalRequest"]
 
+import sys
 from dataclasses import dataclass, field
 from enum import Enum
 import enum
 from enum import Enum, auto
-from typing import Literal, List, Dict, Any, Optional
+from typing import Literal, List, Dict, Any, Optional, Iterable, Tuple
 from pydantic import BaseModel, Field
 from datetime import datetime
 
-from hippoium.core.utils.time import utc_now
+from hippoium.core.utils.time import cached_utc_now
 
+# graph 節點 / 邊數量大，3.10+ 以 __slots__ 降低記憶體與屬性存取成本
+_SLOTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
 
@@ -143,7 +146,7 @@ class EdgeType(str, Enum):
     CUSTOM     = "custom"      # 外掛自訂
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Chunk:
     uid: str
     parent_id: str
@@ -154,7 +157,7 @@ class Chunk:
     embedding: Optional[List[float]] = None
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class GraphEdge:
     src: str
     dst: str
@@ -162,25 +165,76 @@ class GraphEdge:
     meta: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
 class DocGraph:
-    parent_id: str
-    nodes: Dict[str, Chunk]
-    edges: List[GraphEdge] = field(default_factory=list)  # ★ 加這行
-
+    """Chunks of one document plus the edges between them.
+
+    ``edges`` is a read-only tuple: add edges with ``add_edge`` or replace the
+    whole set by assigning ``edges``, so the src → out-edges index used by
+    ``iter_out`` can never go stale.
+    """
+
+    __slots__ = ("parent_id", "nodes", "_edges", "_edges_view", "_out")
+
+    def __init__(
+        self,
+        parent_id: str,
+        nodes: Dict[str, Chunk],
+        edges: Iterable[GraphEdge] = (),
+    ) -> None:
+        self.parent_id = parent_id
+        self.nodes = nodes
+        self.edges = edges
+
+    @property
+    def edges(self) -> Tuple[GraphEdge, ...]:
+        view = self._edges_view
+        if view is None:
+            view = self._edges_view = tuple(self._edges)
+        return view
+
+    @edges.setter
+    def edges(self, edges: Iterable[GraphEdge]) -> None:
+        self._edges: List[GraphEdge] = []
+        self._edges_view: Optional[Tuple[GraphEdge, ...]] = None
+        self._out: Dict[str, List[GraphEdge]] = {}
+        for edge in edges:
+            self.add_edge(edge)
+
+    def __repr__(self) -> str:
+        return (
+            f"DocGraph(parent_id={self.parent_id!r}, nodes={self.nodes!r}, "
+            f"edges={self._edges!r})"
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, DocGraph):
+            return NotImplemented
+        return (self.parent_id, self.nodes, self._edges) == (
+            other.parent_id,
+            other.nodes,
+            other._edges,
+        )
+
+    __hash__ = None
 
     # —— utility helpers ——
+    def add_edge(self, edge: GraphEdge) -> None:
+        self._edges.append(edge)
+        self._edges_view = None
+        self._out.setdefault(edge.src, []).append(edge)
+
     def iter_out(self, uid: str, rel: EdgeType | None = None):
-        for e in self.edges:
-            if e.src == uid and (rel is None or e.rel == rel):
-                yield e
+        bucket = self._out.get(uid, ())
+        if rel is None:
+            return iter(bucket)
+        return (e for e in bucket if e.rel == rel)
 
 
 class Message(BaseModel):
     id: str
     role: str  # user / assistant / system
     content: str
-    created_at: datetime = Field(default_factory=utc_now)
+    created_at: datetime = Field(default_factory=cached_utc_now)
     label: MsgLabel | None = None
 
 
@@ -189,7 +243,7 @@ class Artifact(BaseModel):
     type: ArtifactType
     data: Any
     checksum: str
-    created_at: datetime = Field(default_factory=utc_now)
+    created_at: datetime = Field(default_factory=cached_utc_now)
 
 
 class RetrievalRequest(BaseModel):
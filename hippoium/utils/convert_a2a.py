@@ -1,8 +1,25 @@
 # utils/convert_a2a.py
 
+from types import SimpleNamespace
 from typing import Any, Dict
 from hippoium.utils.converter_registry import BaseConverter
 
+# Resolve internal classes once; fall back to plain attribute bags when the
+# core types are not available (e.g. during tests).
+try:
+    from hippoium.core.memory import MemoryItem as _MemoryItem
+except ImportError:
+    _MemoryItem = SimpleNamespace
+try:
+    from hippoium.core.prompt import PromptTemplate as _PromptTemplate
+except ImportError:
+    _PromptTemplate = SimpleNamespace
+try:
+    from hippoium.core.tool import ToolSpec as _ToolSpec
+except ImportError:
+    _ToolSpec = SimpleNamespace
+
+
 class A2AConverter(BaseConverter):
     """Converter for Google's Agent-to-Agent (A2A) protocol format."""
     name = "a2a"
@@ -41,15 +58,7 @@ class A2AConverter(BaseConverter):
                 content = str(parts[0])  # fallback: represent non-text content as str
         key = data.get("artifactId")
         metadata = {"name": data.get("name", "")}
-        try:
-            from hippoium.core.memory import MemoryItem as _MemoryItem
-            return _MemoryItem(content=content, key=key, metadata=metadata)
-        except ImportError:
-            dummy = type("MemoryItem", (), {})()
-            dummy.content = content
-            dummy.key = key
-            dummy.metadata = metadata
-            return dummy
+        return _MemoryItem(content=content, key=key, metadata=metadata)
 
     def convert_prompt_template(self, template: Any) -> Dict[str, Any]:
         """Convert an internal PromptTemplate to A2A message format (system role)."""
@@ -78,15 +87,7 @@ class A2AConverter(BaseConverter):
                     break
         name = "system_prompt"
         description = None
-        try:
-            from hippoium.core.prompt import PromptTemplate as _PromptTemplate
-            return _PromptTemplate(name=name, content=content, description=description)
-        except ImportError:
-            dummy = type("PromptTemplate", (), {})()
-            dummy.name = name
-            dummy.content = content
-            dummy.description = description
-            return dummy
+        return _PromptTemplate(name=name, content=content, description=description)
 
     def convert_tool_spec(self, tool: Any) -> Dict[str, Any]:
         """Convert an internal ToolSpec to A2A capability format."""
@@ -94,7 +95,7 @@ class A2AConverter(BaseConverter):
         capability = {
             "name": tool.name,
             "description": getattr(tool, "description", "") or "",
-            "parameters": tool.parameters if hasattr(tool, "parameters") else {}
+            "parameters": getattr(tool, "parameters", {})
         }
         # In a full A2A Agent Card, capabilities might include endpoints or auth, which are omitted here.
         return capability
@@ -104,12 +105,4 @@ class A2AConverter(BaseConverter):
         name = data.get("name") or ""
         description = data.get("description") or ""
         parameters = data.get("parameters") or {}
-        try:
-            from hippoium.core.tool import ToolSpec as _ToolSpec
-            return _ToolSpec(name=name, description=description, parameters=parameters)
-        except ImportError:
-            dummy = type("ToolSpec", (), {})()
-            dummy.name = name
-            dummy.description = description
-            dummy.parameters = parameters
-            return dummy
\ No newline at end of file
+        return _ToolSpec(name=name, description=description, parameters=parameters)
\ No newline at end of file
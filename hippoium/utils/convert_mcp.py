@@ -1,9 +1,27 @@
 # utils/convert_mcp.py
 
+from types import SimpleNamespace
 from typing import Any
 
 from hippoium.utils.converter_registry import BaseConverter
 
+# Resolve internal classes once; fall back to plain attribute bags when the
+# core types are not available (e.g. during tests).
+try:
+    from hippoium.core.memory import MemoryItem as _MemoryItem
+except ImportError:
+    _MemoryItem = SimpleNamespace
+try:
+    from hippoium.core.prompt import PromptTemplate as _PromptTemplate
+except ImportError:
+    _PromptTemplate = SimpleNamespace
+try:
+    from hippoium.core.tool import ToolSpec as _ToolSpec
+except ImportError:
+    _ToolSpec = SimpleNamespace
+
+_MEMORY_SCHEME = "memory://"
+
 
 class MCPConverter(BaseConverter):
     """Converter for Anthropic's Model Context Protocol (MCP) format."""
@@ -13,28 +31,19 @@ class MCPConverter(BaseConverter):
         """Convert an internal MemoryItem to MCP resource format (as a dict)."""
         # Assume MemoryItem has attributes: content (str), key (optional id),
         # metadata (dict)
-        uri = None
-        if hasattr(item, "key") and item.key:
-            # use provided key to form URI
-            uri = f"memory://{item.key}"
-        else:
-            # generate a dummy URI if no key (e.g., using id of object)
-            uri = f"memory://{id(item)}"
-        mime = "text/plain"
-        # if metadata has mime_type, use it
-        if hasattr(item, "metadata") and item.metadata and "mime_type" in item.metadata:
-            mime = item.metadata["mime_type"]
-        # prepare MCP resource dictionary
+        # use provided key to form URI, else a dummy one from the object id
+        uri = f"{_MEMORY_SCHEME}{getattr(item, 'key', None) or id(item)}"
+        meta = getattr(item, "metadata", None) or {}
+        # prepare MCP resource dictionary (metadata mime_type wins if present)
         resource = {
             "uri": uri,
-            "mime_type": mime,
+            "mime_type": meta.get("mime_type", "text/plain"),
             "content": item.content,
         }
         # include a display name or description if available
-        if hasattr(item, "metadata") and item.metadata:
-            desc = item.metadata.get("description") or item.metadata.get("name")
-            if desc:
-                resource["description"] = desc
+        desc = meta.get("description") or meta.get("name")
+        if desc:
+            resource["description"] = desc
         return resource
 
     def parse_memory_item(self, data: dict[str, Any]) -> Any:
@@ -45,8 +54,12 @@ class MCPConverter(BaseConverter):
         key = None
         uri = data.get("uri", "")
         if uri:
-            # strip scheme if present
-            key = uri.split("://", 1)[-1]
+            # strip scheme if present (our own memory:// URIs take the fast path)
+            if uri.startswith(_MEMORY_SCHEME):
+                key = uri[len(_MEMORY_SCHEME):]
+            else:
+                _, sep, rest = uri.partition("://")
+                key = rest if sep else uri
         # Metadata can include mime_type and description
         metadata = {}
         if "mime_type" in data:
@@ -56,30 +69,19 @@ class MCPConverter(BaseConverter):
         # Construct MemoryItem (assuming a constructor:
         # MemoryItem(content, key, metadata)).
         # If actual MemoryItem is defined elsewhere, import and use it here.
-        try:
-            from hippoium.core.memory import MemoryItem as _MemoryItem
-            return _MemoryItem(content=content, key=key, metadata=metadata)
-        except ImportError:
-            # Fallback if core classes are not available (e.g. during tests)
-            dummy = type("MemoryItem", (), {})()
-            dummy.content = content
-            dummy.key = key
-            dummy.metadata = metadata
-            return dummy
+        return _MemoryItem(content=content, key=key, metadata=metadata)
 
     def convert_prompt_template(self, template: Any) -> dict[str, Any]:
         """Convert an internal PromptTemplate to MCP prompt format."""
         # Assume PromptTemplate has attributes: name (str) and content (str)
-        name = template.name if hasattr(template, "name") else None
         prompt_data = {
-            "name": name or "prompt",
+            "name": getattr(template, "name", None) or "prompt",
             "template": template.content,
         }
         # Optionally include description if present
-        if hasattr(template, "description"):
-            desc = template.description
-            if desc:
-                prompt_data["description"] = desc
+        desc = getattr(template, "description", None)
+        if desc:
+            prompt_data["description"] = desc
         return prompt_data
 
     def parse_prompt_template(self, data: dict[str, Any]) -> Any:
@@ -89,24 +91,16 @@ class MCPConverter(BaseConverter):
         content = data.get("template") or ""
         description = data.get("description") or None
         # Construct PromptTemplate (assuming PromptTemplate(name, content, description))
-        try:
-            from hippoium.core.prompt import PromptTemplate as _PromptTemplate
-            return _PromptTemplate(name=name, content=content, description=description)
-        except ImportError:
-            dummy = type("PromptTemplate", (), {})()
-            dummy.name = name
-            dummy.content = content
-            dummy.description = description
-            return dummy
+        return _PromptTemplate(name=name, content=content, description=description)
 
     def convert_tool_spec(self, tool: Any) -> dict[str, Any]:
         """Convert an internal ToolSpec to MCP tool descriptor format."""
         # Assume ToolSpec has attributes: name, description, parameters (dict)
-        description = tool.description if hasattr(tool, "description") else ""
+        description = getattr(tool, "description", "")
         tool_data = {
             "name": tool.name,
             "description": description or "",
-            "parameters": tool.parameters if hasattr(tool, "parameters") else {},
+            "parameters": getattr(tool, "parameters", {}),
         }
         return tool_data
 
@@ -116,12 +110,4 @@ class MCPConverter(BaseConverter):
         name = data.get("name") or ""
         description = data.get("description") or ""
         parameters = data.get("parameters") or {}
-        try:
-            from hippoium.core.tool import ToolSpec as _ToolSpec
-            return _ToolSpec(name=name, description=description, parameters=parameters)
-        except ImportError:
-            dummy = type("ToolSpec", (), {})()
-            dummy.name = name
-            dummy.description = description
-            dummy.parameters = parameters
-            return dummy
+        return _ToolSpec(name=name, description=description, parameters=parameters)
@@ -1,6 +1,10 @@
 import importlib
 import importlib.util
+import os
 from abc import ABC, abstractmethod
+from functools import lru_cache, singledispatch
+from threading import RLock
+from types import ModuleType
 from typing import Any, Optional, Union
 
 try:
@@ -8,6 +12,44 @@ try:
 except ImportError:
     yaml = None
 
+try:
+    from yaml import CSafeLoader as _YamlLoader  # libyaml 版本快 5~10 倍
+except ImportError:
+    _YamlLoader = getattr(yaml, "SafeLoader", None)
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover - optional speed-up
+    from json import loads as _json_loads
+
+_DEFAULT_CONFIG_PATH = "config/context_exchange.yaml"
+
+
+@lru_cache(maxsize=32)
+def _load_cfg(path: str, mtime: float) -> dict[str, Any]:
+    """依副檔名解析設定檔；以 (path, mtime) 快取，檔案更新後自動重讀。"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".json":
+        with open(path, "rb") as f:
+            return _json_loads(f.read()) or {}
+    if ext == ".toml" and tomllib is not None:
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    if yaml is None:
+        raise RuntimeError("PyYAML 未安裝且未傳入 config dict")
+    with open(path, encoding="utf-8") as f:
+        return yaml.load(f, Loader=_YamlLoader) or {}
+
+
+# detect_format 用的特徵 key（set 交集檢查，免逐一 any() 掃描）
+_MCP_KEYS = frozenset({"resources", "prompts", "tools"})
+_A2A_KEYS = frozenset({"capabilities", "artifactId", "artifacts", "history"})
+
 
 # --------------------------------------------------------------------- #
 # Abstract base for all converters
@@ -34,23 +76,80 @@ class BaseConverter(ABC):
     def parse_tool_spec(self, data: Any) -> Any: ...
 
 
+# --------------------------------------------------------------------- #
+# Type dispatch
+# --------------------------------------------------------------------- #
+@singledispatch
+def _convert(obj: Any, conv: BaseConverter) -> Any:
+    # 未註冊的型別（例如測試用 SimpleNamespace）沿用 duck-typing 判斷
+    if hasattr(obj, "parameters"):
+        return conv.convert_tool_spec(obj)
+    if hasattr(obj, "metadata"):
+        return conv.convert_memory_item(obj)
+    return conv.convert_prompt_template(obj)
+
+
+# 內部型別 → converter 方法名；首次呼叫時才 import，避免循環依賴
+_INTERNAL_TYPES = (
+    ("hippoium.ports.domain", "MemoryItem", "convert_memory_item"),
+    ("hippoium.ports.domain", "ToolSpec", "convert_tool_spec"),
+    ("hippoium.ports.mcp", "PromptTemplate", "convert_prompt_template"),
+)
+_types_registered = False
+_types_lock = RLock()
+
+
+def _register_internal_types() -> None:
+    global _types_registered
+    with _types_lock:
+        if _types_registered:
+            return
+        for module_path, cls_name, method in _INTERNAL_TYPES:
+            try:
+                cls = getattr(importlib.import_module(module_path), cls_name)
+            except (ImportError, AttributeError):
+                continue
+            _convert.register(
+                cls, lambda obj, conv, _m=method: getattr(conv, _m)(obj)
+            )
+        # 全部註冊完才設旗標，並行的首次呼叫會在 lock 上等待
+        _types_registered = True
+
+
+# parse_from_format 的 target 名稱 → converter 方法名（依序比對子字串）
+_PARSE_METHODS = (
+    ("tool", "parse_tool_spec"),
+    ("memory", "parse_memory_item"),
+    ("prompt", "parse_prompt_template"),
+    ("template", "parse_prompt_template"),
+)
+_parse_cache: dict[str, Optional[str]] = {}
+
+
+def _parse_method(target: Union[str, type]) -> Optional[str]:
+    name = target if isinstance(target, str) else getattr(target, "__name__", "")
+    try:
+        return _parse_cache[name]
+    except KeyError:
+        pass
+    lowered = name.lower()
+    method = next((m for key, m in _PARSE_METHODS if key in lowered), None)
+    _parse_cache[name] = method
+    return method
+
+
 # --------------------------------------------------------------------- #
 # Registry
 # --------------------------------------------------------------------- #
 class ConverterRegistry:
+    # 已解析的 converter 模組（跨 instance 共用，避免重複 import）
+    _module_cache: dict[str, ModuleType] = {}
+
     def __init__(self, config: Optional[Union[str, dict[str, Any]]] = None) -> None:
-        # 1️⃣ 讀 YAML or dict
-        if config is None:
-            path = "config/context_exchange.yaml"
-            if yaml is None:
-                raise RuntimeError("PyYAML 未安裝且未傳入 config dict")
-            with open(path, encoding="utf-8") as f:
-                cfg: dict[str, Any] = yaml.safe_load(f) or {}
-        elif isinstance(config, str):
-            if yaml is None:
-                raise RuntimeError("PyYAML 未安裝且 config 為路徑")
-            with open(config, encoding="utf-8") as f:
-                cfg = yaml.safe_load(f) or {}
+        # 1️⃣ 讀設定檔 (YAML / JSON / TOML，已解析結果會快取) or dict
+        if config is None or isinstance(config, str):
+            path = config or _DEFAULT_CONFIG_PATH
+            cfg: dict[str, Any] = _load_cfg(path, os.path.getmtime(path))
         else:
             cfg = config or {}
 
@@ -61,6 +160,9 @@ class ConverterRegistry:
         self._converters: dict[str, BaseConverter] = {}
         for fmt, dotted in (cfg.get("converters") or {}).items():
             self._register_from_path(fmt, dotted)
+        # 建構時就完成型別註冊，請求路徑只剩 dispatch 查表
+        if not _types_registered:
+            _register_internal_types()
 
     # ---------- public API ------------------------------------------- #
     def register_converter(
@@ -86,12 +188,9 @@ class ConverterRegistry:
         if conv is None:
             raise ValueError(f"No converter for format: {fmt}")
 
-        # 粗略判斷型別
-        if hasattr(obj, "parameters"):
-            return conv.convert_tool_spec(obj)
-        if hasattr(obj, "metadata"):
-            return conv.convert_memory_item(obj)
-        return conv.convert_prompt_template(obj)
+        if not _types_registered:
+            _register_internal_types()
+        return _convert(obj, conv)
 
     # ---------------- parse_from_format ------------------------------ #
     def parse_from_format(self, fmt: str, data: Any, target: Union[str, type]) -> Any:
@@ -105,15 +204,10 @@ class ConverterRegistry:
         if conv is None:
             raise ValueError(f"No converter for format: {fmt}")
 
-        name = target if isinstance(target, str) else getattr(target, "__name__", "")
-        name = name.lower()
-        if "tool" in name:
-            return conv.parse_tool_spec(data)
-        if "memory" in name:
-            return conv.parse_memory_item(data)
-        if "prompt" in name or "template" in name:
-            return conv.parse_prompt_template(data)
-        raise ValueError(f"Unknown target type: {target}")
+        method = _parse_method(target)
+        if method is None:
+            raise ValueError(f"Unknown target type: {target}")
+        return getattr(conv, method)(data)
 
     # ---------------- detect_format ---------------------------------- #
     def detect_format(self, data: Any) -> str:
@@ -124,19 +218,15 @@ class ConverterRegistry:
         if data is None:
             return "hippoium"
         if isinstance(data, str):
-            import json
             try:
-                data = json.loads(data)
+                data = _json_loads(data)
             except Exception:
                 return "hippoium"
 
         if isinstance(data, dict):
-            if any(k in data for k in ("resources", "prompts", "tools")):
+            if not _MCP_KEYS.isdisjoint(data):
                 return "mcp"
-            if any(
-                k in data
-                for k in ("capabilities", "artifactId", "artifacts", "history")
-            ):
+            if not _A2A_KEYS.isdisjoint(data):
                 return "a2a"
         return "hippoium"
 
@@ -154,32 +244,29 @@ class ConverterRegistry:
             raise ValueError(f"No converter for format: {fmt}")
 
         out: dict[str, list] = {}
+        # 先綁定 parser，避免每個元素重複屬性查找
+        parse_mem = conv.parse_memory_item
+        parse_prompt = conv.parse_prompt_template
+        parse_tool = conv.parse_tool_spec
         if fmt == "mcp":
             if "resources" in data:
-                out["memory_items"] = [
-                    conv.parse_memory_item(r) for r in data["resources"]
-                ]
+                out["memory_items"] = list(map(parse_mem, data["resources"]))
             if "prompts" in data:
-                out["prompt_templates"] = [
-                    conv.parse_prompt_template(p) for p in data["prompts"]
-                ]
+                out["prompt_templates"] = list(map(parse_prompt, data["prompts"]))
             if "tools" in data:
-                out["tool_specs"] = [conv.parse_tool_spec(t) for t in data["tools"]]
+                out["tool_specs"] = list(map(parse_tool, data["tools"]))
         elif fmt == "a2a":
             if "artifacts" in data:
-                out["memory_items"] = [
-                    conv.parse_memory_item(a) for a in data["artifacts"]
-                ]
+                out["memory_items"] = list(map(parse_mem, data["artifacts"]))
             if "capabilities" in data:
-                out["tool_specs"] = [
-                    conv.parse_tool_spec(c) for c in data["capabilities"]
-                ]
+                out["tool_specs"] = list(map(parse_tool, data["capabilities"]))
             if "history" in data:
-                sys_prompts = [m for m in data["history"] if m.get("role") == "system"]
+                sys_prompts = [
+                    parse_prompt(m) for m in data["history"]
+                    if m.get("role") == "system"
+                ]
                 if sys_prompts:
-                    out["prompt_templates"] = [
-                        conv.parse_prompt_template(m) for m in sys_prompts
-                    ]
+                    out["prompt_templates"] = sys_prompts
         return out
 
     # ---------- internal: import helper ------------------------------ #
@@ -191,12 +278,19 @@ class ConverterRegistry:
             raise RuntimeError(f"{dotted} 找不到 {cls_name}")
         self.register_converter(cls(), name=fmt)
 
-    def _safe_import(self, module_path: str):
+    def _safe_import(self, module_path: str) -> ModuleType:
+        cache = ConverterRegistry._module_cache
+        module = cache.get(module_path)
+        if module is not None:
+            return module
         try:
-            return importlib.import_module(module_path)
+            module = importlib.import_module(module_path)
         except ModuleNotFoundError:
-            if not module_path.startswith("hippoium."):
-                alt = f"hippoium.{module_path}"
-                if importlib.util.find_spec(alt):
-                    return importlib.import_module(alt)
-            raise
+            if module_path.startswith("hippoium."):
+                raise
+            alt = f"hippoium.{module_path}"
+            if not importlib.util.find_spec(alt):
+                raise
+            module = importlib.import_module(alt)
+        cache[module_path] = module
+        return module
@@ -1,11 +1,21 @@
 from datetime import timedelta
 
+import pytest
+
 from hippoium.core.builder.prompt_builder import PromptBuilder
 from hippoium.core.neg_vault import NegativeVault
 from hippoium.engine import DefaultContextEngine, _common_overlap
 from hippoium.ports.mcp import MemoryItem, ToolSpec
 
 
+@pytest.fixture(autouse=True)
+def _reset_negative_vault():
+    # NegativeVault 為類別層級的全域狀態，每個測試前後清空避免互相干擾
+    NegativeVault._vault.clear()
+    yield
+    NegativeVault._vault.clear()
+
+
 def test_conversation_input_and_memory_management():
     # 建立引擎，設定最大訊息數、最大 token 數、session 存活時間
     engine = DefaultContextEngine(
@@ -83,6 +93,15 @@ def test_automatic_annotation_and_filtering():
     assert "WARN" in statuses and "ERR" in statuses and "OK" in statuses
 
 
+def test_common_overlap_periodic_and_disjoint_inputs():
+    # 週期性字串會觸發 KMP failure 回退
+    assert _common_overlap("xxabab", "ababab") == "abab"
+    assert _common_overlap("aaaa", "aaab") == "aaa"
+    assert _common_overlap("abc", "xyz") == ""
+    assert _common_overlap("", "abc") == ""
+    assert _common_overlap("same", "same") == "same"
+
+
 def test_context_compression_dedup_and_diff():
     # 測試重疊偵測與壓縮邏輯
     a = "The user provided details: ABC123"
@@ -170,3 +189,43 @@ def test_prompt_builder_negative_and_tools_slots():
     system_text = "\n".join(m["content"] for m in messages if m["role"] == "system")
     assert "No NSFW." in system_text
     assert "TOOLS_DATA" in system_text
+
+
+def _engine_state(engine):
+    def dump(items):
+        return [(item.content, item.metadata) for item in items]
+
+    return (
+        {key: dump(entry["value"]) for key, entry in engine.s_cache.data.items()},
+        list(engine.m_buffer.data),
+        engine.m_buffer.values(),
+        {key: dump(items) for key, items in engine.l_vector.data.items()},
+        engine.current_session,
+    )
+
+
+def test_write_turns_batch_matches_sequential_writes():
+    turns = [
+        ("user", "Hi there", {"session_id": "s1", "user_id": "alice"}),
+        ("assistant", "Sorry, I cannot do that.", {"session_id": "s1"}),
+        ("user", "Other chat", {"conv_id": "s2", "user_id": "bob"}),
+        ("assistant", "Traceback: error", {"session_id": "s1", "user_id": "alice"}),
+        ("user", "No metadata", None),
+        ("user", "Back to s2", {"conv_id": "s2", "user_id": "alice"}),
+    ]
+
+    def copies():
+        return [(r, c, dict(m) if m is not None else None) for r, c, m in turns]
+
+    sequential = DefaultContextEngine(max_session_turns=2, max_user_items=2)
+    seq_turns = copies()
+    for role, content, metadata in seq_turns:
+        sequential.write_turn(role, content, metadata)
+
+    batched = DefaultContextEngine(max_session_turns=2, max_user_items=2)
+    batch_turns = copies()
+    batched.write_turns_batch(batch_turns)
+
+    assert _engine_state(batched) == _engine_state(sequential)
+    # callers' metadata dicts are annotated the same way
+    assert [m for _, _, m in batch_turns] == [m for _, _, m in seq_turns]
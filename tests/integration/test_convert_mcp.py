@@ -105,3 +105,21 @@ def test_registry_integration_mcp():
     assert getattr(mem_back, "content", None) == mem.content
     assert getattr(prompt_back, "content", None) == prompt.content
     assert getattr(tool_back, "name", None) == tool.name
+
+
+def test_registry_dispatches_on_internal_types():
+    from hippoium.ports.domain import MemoryItem, ToolSpec
+    from hippoium.ports.mcp import PromptTemplate
+
+    registry = ConverterRegistry({})
+    registry.register_converter(MCPConverter())
+
+    # MemoryItem metadata carrying a "parameters" key must not look like a tool
+    mem = MemoryItem(content="hello", metadata={"parameters": {}})
+    assert registry.convert_to_format("mcp", mem)["content"] == "hello"
+    tool = ToolSpec(name="t", description="d", args_schema={"a": 1})
+    assert registry.convert_to_format("mcp", tool)["parameters"] == {"a": 1}
+    prompt = PromptTemplate(content="x", name="p")
+    assert registry.convert_to_format("mcp", prompt)["template"] == "x"
+
+    assert registry.parse_from_format("mcp", {"name": "t"}, ToolSpec).name == "t"
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import sys
+import types
+from dataclasses import dataclass, field
+
+import pytest
+
+
+@dataclass
+class _ContextRecord:
+    role: str
+    content: str
+    meta: dict = field(default_factory=dict)
+
+
+@pytest.fixture
+def mcp_bridge(monkeypatch):
+    stub = types.ModuleType("mcp_sdk")
+    stub.ContextRecord = _ContextRecord
+    stub.ContextQuery = object
+    stub.ContextBundle = object
+    monkeypatch.setitem(sys.modules, "mcp_sdk", stub)
+    monkeypatch.delitem(sys.modules, "hippoium.integrations.mcp_bridge", raising=False)
+    return importlib.import_module("hippoium.integrations.mcp_bridge")
+
+
+class _BatchEngine:
+    def __init__(self, fail_on: str | None = None):
+        self.fail_on = fail_on
+        self.batches = []
+
+    def write_turns_batch(self, turns):
+        turns = list(turns)
+        if any(content == self.fail_on for _, content, _ in turns):
+            raise RuntimeError("engine write failed")
+        self.batches.append(turns)
+
+
+def test_queued_records_are_written_in_batches(mcp_bridge):
+    engine = _BatchEngine()
+    bridge = mcp_bridge.MCPBridge(engine)
+
+    async def run():
+        for i in range(3):
+            await bridge.arecord_context(_ContextRecord("user", f"m{i}", {"i": i}))
+        await bridge.aclose()
+        assert bridge._drainer is None
+
+    asyncio.run(run())
+    written = [content for batch in engine.batches for _, content, _ in batch]
+    assert written == ["m0", "m1", "m2"]
+
+
+def test_write_errors_surface_from_flush_and_drainer_survives(mcp_bridge):
+    engine = _BatchEngine(fail_on="bad")
+    bridge = mcp_bridge.MCPBridge(engine)
+
+    async def run():
+        await bridge.arecord_context(_ContextRecord("user", "bad"))
+        with pytest.raises(RuntimeError, match="engine write failed"):
+            await bridge.flush()
+        await bridge.arecord_context(_ContextRecord("user", "good"))
+        await bridge.aclose()
+
+    asyncio.run(run())
+    assert [content for batch in engine.batches for _, content, _ in batch] == ["good"]
@@ -46,8 +46,8 @@ class SourceAnnotationTest(unittest.TestCase):
             graph.nodes[bid] = types.Chunk(
                 uid=bid, parent_id=parent, content=content, chunk_type=btype
             )
-            graph.edges.append(types.GraphEdge(src=parent, dst=bid,
-                                               rel=EdgeType.EMBEDS))
+            graph.add_edge(types.GraphEdge(src=parent, dst=bid,
+                                   rel=EdgeType.EMBEDS))
 
         # — 斷言 —
         # (a) 每個 chunk 皆至少有一條 BELONGS_TO
@@ -22,3 +22,27 @@ def test_hybrid_scorer_with_mock_embeddings():
     scores = scorer.score("query", docs)
 
     assert len(scores) == len(docs)
+
+
+class _StubEmbedder:
+    def __init__(self):
+        self.calls = []
+
+    def embed(self, texts, **opts):
+        texts = list(texts)
+        self.calls.append(texts)
+        table = {"query": [1.0, 0.0], "yreuq": [0.0, 1.0]}
+        return [table.get(t, [1.0, 1.0] if t == "both" else [1.0, 0.0]) for t in texts]
+
+
+def test_hybrid_scorer_embeds_in_one_batch():
+    embedder = _StubEmbedder()
+    scorer = HybridScorer(embedding_client=embedder, beta=0.5)
+    docs = [Message(role="user", content="query"), Message(role="user", content="both")]
+
+    scores = scorer.score("query", docs)
+
+    assert embedder.calls == [["query", "yreuq", "query", "both"]]
+    assert scores[0] == pytest.approx(1.0)
+    assert scores[1] == pytest.approx((1 - 0.5) / 2 ** 0.5)
+    assert scorer.score("query", []) == []
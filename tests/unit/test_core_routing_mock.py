@@ -35,3 +35,40 @@ def test_fallback_manager_uses_secondary_on_failure():
     assert result == "secondary"
     assert primary.calls
     assert secondary.calls
+
+
+def test_fallback_manager_serves_repeated_prompt_from_semantic_cache():
+    from hippoium.core.routing.semantic_cache import SemanticCache
+
+    vectors = {"hello": [1.0, 0.0], "hello!": [0.99, 0.05], "bye": [0.0, 1.0]}
+    primary = FakeClient("primary")
+    cache = SemanticCache(lambda text: vectors[text])
+    manager = FallbackManager(primary=primary, secondary=FakeClient("s"), cache=cache)
+
+    assert manager.execute("hello") == "primary"
+    assert manager.execute("hello!") == "primary"
+    assert len(primary.calls) == 1
+    manager.execute("bye")
+    assert len(primary.calls) == 2
+
+
+def test_semantic_cache_skips_expired_best_match():
+    import pytest
+
+    from hippoium.core.routing.semantic_cache import SemanticCache
+
+    now = [0.0]
+    vectors = {"q": [1.0, 0.0], "stale": [1.0, 0.0], "live": [0.95, 0.3]}
+    cache = SemanticCache(
+        lambda text: vectors[text], dup_threshold=0.999, ttl=10.0, clock=lambda: now[0]
+    )
+    cache.put("stale", "old")
+    now[0] = 8.0
+    cache.put("live", "new")
+    now[0] = 12.0  # "stale" (the closer match) expired, "live" has not
+
+    assert cache.get("q") == "new"
+    assert len(cache) == 1
+
+    with pytest.raises(ValueError):
+        SemanticCache(lambda text: vectors[text], max_entries=0)
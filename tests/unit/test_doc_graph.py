@@ -0,0 +1,31 @@
+import pytest
+
+from hippoium.ports.port_types import DocGraph, EdgeType, GraphEdge
+
+
+def test_iter_out_uses_index():
+    graph = DocGraph(parent_id="doc", nodes={}, edges=[GraphEdge("a", "b", EdgeType.NEXT)])
+    graph.add_edge(GraphEdge("a", "c", EdgeType.REF))
+    graph.add_edge(GraphEdge("b", "a", EdgeType.PREV))
+
+    assert [e.dst for e in graph.iter_out("a")] == ["b", "c"]
+    assert [e.dst for e in graph.iter_out("a", EdgeType.REF)] == ["c"]
+    assert [e.dst for e in graph.iter_out("b")] == ["a"]
+    assert list(graph.iter_out("missing")) == []
+    assert [e.dst for e in graph.edges] == ["b", "c", "a"]
+
+    graph.edges = [GraphEdge("x", "y", EdgeType.NEXT)]
+    assert list(graph.iter_out("a")) == []
+    assert [e.dst for e in graph.iter_out("x")] == ["y"]
+
+
+def test_edges_cannot_be_mutated_behind_the_index():
+    graph = DocGraph(parent_id="doc", nodes={}, edges=[GraphEdge("a", "b", EdgeType.NEXT)])
+
+    with pytest.raises(TypeError):
+        graph.edges[0] = GraphEdge("x", "y", EdgeType.NEXT)
+    with pytest.raises(AttributeError):
+        graph.edges.append(GraphEdge("x", "y", EdgeType.NEXT))
+
+    assert [e.dst for e in graph.iter_out("a")] == ["b"]
+    assert list(graph.iter_out("x")) == []
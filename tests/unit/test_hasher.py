@@ -0,0 +1,19 @@
+from hippoium.core.utils.hasher import RollingHasher, rolling_hash, window_hashes
+
+
+def test_shift_matches_fresh_window_hash():
+    tokens = "the quick brown fox jumps over the lazy dog".split()
+    window = 3
+    fresh = []
+    for i in range(len(tokens) - window + 1):
+        h = RollingHasher(window)
+        for t in tokens[i : i + window]:
+            h.extend(t)
+        fresh.append(h.value)
+    assert list(window_hashes(tokens, window)) == fresh
+    assert fresh[0] != fresh[1]
+
+
+def test_rolling_hash_is_deterministic():
+    assert rolling_hash(["a", "b"]) == rolling_hash(["a", "b"])
+    assert rolling_hash(["a", "b"]) != rolling_hash(["b", "a"])
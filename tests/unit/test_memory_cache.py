@@ -1,7 +1,17 @@
 from datetime import datetime, timedelta, timezone
 
+import pytest
+
 from hippoium.core.cer.cache import TierCache
-from hippoium.core.memory.stores import ColdStore, LVector, MBuffer, SCache, build_namespaced_key
+from hippoium.core.memory.lifecycle import LifecycleManager
+from hippoium.core.memory.stores import (
+    ColdStore,
+    LVector,
+    MBuffer,
+    MMapColdStore,
+    SCache,
+    build_namespaced_key,
+)
 from hippoium.ports.port_types import MemTier
 
 
@@ -32,6 +42,61 @@ def test_scache_basic_ttl_and_capacity():
     assert sc.get("level") is None
 
 
+def test_scache_touch_refreshes_ttl():
+    clock = FakeClock(datetime.now(timezone.utc))
+    sc = SCache(ttl=timedelta(seconds=2), clock=clock)
+    sc.put("history", ["a"])
+    clock.advance(timedelta(seconds=1.5))
+    sc.get("history").append("b")
+    assert sc.touch("history")
+    clock.advance(timedelta(seconds=1.5))
+    assert sc.get("history") == ["a", "b"]
+    assert not sc.touch("missing")
+
+
+def test_scache_append_keeps_bounded_deque_by_reference():
+    sc = SCache(ttl=None)
+    first = sc.append("conv", 1, maxlen=2)
+    sc.append("conv", 2, maxlen=2)
+    sc.append("conv", 3, maxlen=2)
+    assert sc.get("conv") is first
+    assert list(first) == [2, 3]
+
+
+def test_scache_tlru_evicts_light_sessions_first():
+    sc = SCache(capacity=2, ttl=None, weigher=len, tlru_threshold=3)
+    sc.put("long", [1, 2, 3, 4])
+    sc.put("short", [1])
+    sc.put("new", [1, 2])
+    assert sc.get("long") == [1, 2, 3, 4]
+    assert sc.get("short") is None
+    sc.put("newer", [1])
+    assert sc.get("new") is None
+    assert sc.get("long") is not None
+
+
+def test_scache_tlru_caches_weights_until_entries_change():
+    calls = []
+
+    def weigher(value):
+        calls.append(len(value))
+        return len(value)
+
+    sc = SCache(capacity=3, ttl=None, weigher=weigher, tlru_threshold=3)
+    sc.put("a", [1, 2, 3])
+    sc.put("b", [1, 2, 3])
+    sc.put("c", [1, 2, 3])
+    sc.put("d", [1, 2, 3])  # nothing light: weighs all, evicts oldest
+    assert calls == [3, 3, 3] and sc.get("a") is None
+    sc.put("e", [1, 2, 3])  # only the new entry "d" needs weighing
+    assert calls == [3, 3, 3, 3] and sc.get("b") is None
+
+    sc.get("c").clear()  # mutated in place, then touched: weight is dropped
+    sc.touch("c")
+    sc.put("f", [1])
+    assert sc.get("c") is None  # re-weighed as light
+
+
 def test_mbuffer_eviction_by_count_and_tokens():
     clock = FakeClock(datetime.now(timezone.utc))
     mb = MBuffer(max_messages=3, max_tokens=6, clock=clock)
@@ -48,6 +113,19 @@ def test_mbuffer_eviction_by_count_and_tokens():
     assert all(mb.get(k) is None for k in ("m2", "m3", "m4"))
 
 
+def test_mbuffer_2q_keeps_reaccessed_entries():
+    mb = MBuffer(max_messages=3, ttl=None, policy="2q")
+    mb.put("a", "alpha")
+    mb.put("b", "beta")
+    assert mb.get("a") == "alpha"  # promoted out of probation
+    mb.put("c", "gamma")
+    mb.put("d", "delta")
+    mb.put("e", "epsilon")
+    assert mb.get("a") == "alpha"
+    assert mb.get("b") is None
+    assert list(mb.data) == ["a", "d", "e"]
+
+
 def test_mbuffer_ttl_expiry():
     clock = FakeClock(datetime.now(timezone.utc))
     mb = MBuffer(max_messages=5, max_tokens=100, ttl=timedelta(seconds=1), clock=clock)
@@ -68,6 +146,21 @@ def test_mbuffer_oversize_rejected():
         raise AssertionError("Expected oversize message to raise ValueError")
 
 
+def test_lifecycle_sweep_keeps_2q_queues_consistent():
+    clock = FakeClock(datetime.now(timezone.utc))
+    mb = MBuffer(max_messages=2, ttl=None, clock=clock, policy="2q")
+    mb.put("a", "one")
+    mb.put("b", "two")
+    clock.advance(timedelta(hours=1))
+    LifecycleManager(SCache(clock=clock), mb, LVector(), clock=clock).sweep()
+    assert not mb.data and mb._token_count == 0
+
+    mb.put("c", "three")
+    mb.put("d", "four")
+    mb.put("e", "five")  # evicts via the 2Q queues
+    assert list(mb.data) == ["d", "e"]
+
+
 def test_lvector_basic_and_capacity():
     lv = LVector(capacity=2)
     lv.put("k1", [1, 2, 3])
@@ -78,6 +171,13 @@ def test_lvector_basic_and_capacity():
     assert lv.get("k3") == [7, 8, 9]
 
 
+def test_lvector_append_caps_items_per_key():
+    lv = LVector()
+    for i in range(5):
+        lv.append("user:alice", i, max_per_key=3)
+    assert list(lv.get("user:alice")) == [2, 3, 4]
+
+
 def test_coldstore_basic():
     cold = ColdStore(capacity=1)
     cold.put("a", "dataA")
@@ -132,3 +232,101 @@ def test_tiercache_integration():
     assert tc.get("vec1", MemTier.L) is None
     tc.put("archive", {"text": "old"}, MemTier.COLD)
     assert tc.get("archive", MemTier.COLD) == {"text": "old"}
+
+
+def test_mmap_coldstore_persists_across_reopen(tmp_path):
+    path = tmp_path / "cold.bin"
+    cold = MMapColdStore(path)
+    cold.put("a", {"text": "old"})
+    cold.put("b", "dataB")
+    cold.put("a", {"text": "new"})
+    cold.delete("b")
+    assert cold.get("a") == {"text": "new"}
+    assert cold.get("b") is None
+    cold.close()
+
+    reopened = MMapColdStore(path)
+    assert reopened.get("a") == {"text": "new"}
+    assert reopened.get("b") is None
+    reopened.close()
+
+
+@pytest.mark.parametrize("torn", [b"\x05\x00\x00\x00\x09\x00\x00\x00ke", b"\x02\x00\x00\x00\x00\x00\x00\x00\xff\xfe"])
+def test_mmap_coldstore_recovers_from_torn_tail(tmp_path, torn):
+    path = tmp_path / "cold.bin"
+    cold = MMapColdStore(path)
+    cold.put("a", "dataA")
+    cold.close()
+    good_size = path.stat().st_size
+    with open(path, "ab") as fp:
+        fp.write(torn)  # partial record left by an interrupted append
+
+    reopened = MMapColdStore(path)
+    assert path.stat().st_size == good_size
+    assert reopened.get("a") == "dataA"
+    reopened.put("b", "dataB")
+    reopened.close()
+
+    again = MMapColdStore(path)
+    assert again.get("a") == "dataA"
+    assert again.get("b") == "dataB"
+    again.close()
+
+
+def test_local_write_back_closes_the_store_it_created(tmp_path):
+    from hippoium.core.memory.write_back import LocalWriteBack
+    from hippoium.ports.port_types import Artifact, ArtifactType
+
+    with LocalWriteBack(path=tmp_path / "artifacts.bin") as wb:
+        aid = wb.write(Artifact(id="", type=ArtifactType.JSON, data="payload", checksum=""))
+        assert wb.read(aid) == "payload"
+    assert wb.store._fp.closed
+
+    shared = ColdStore()
+    LocalWriteBack(store=shared).close()  # caller-owned stores stay usable
+    shared.put("k", "v")
+    assert shared.get("k") == "v"
+
+
+def test_lvector_similarity_index_tracks_writes():
+    lv = LVector(capacity=3)
+    lv.put_vector("a", [1.0, 0.0], "a")
+    lv.put_vector("b", [0.0, 1.0], "b")
+    assert [r[0] for r in lv.similarity_search([1.0, 0.0], top_k=1)] == ["a"]
+
+    lv.put_vector("a", [-1.0, 0.0], "a2")  # overwrite in place
+    lv.put_vector("c", [1.0, 1.0], "c")
+    assert [r[1] for r in lv.similarity_search([1.0, 0.0], top_k=3)] == ["c", "b", "a2"]
+
+    lv.put_vector("d", [1.0, 0.0], "d")  # capacity evicts "a"
+    lv.delete("c")
+    lv.put("b", "not a vector")
+    assert [r[0] for r in lv.similarity_search([1.0, 0.0])] == ["d"]
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float16", "int8"])
+def test_lvector_quantized_index_matches_exact_ranking(dtype):
+    exact, quantized = LVector(), LVector(dtype=dtype)
+    vectors = {"a": [1.0, 0.0, 0.0], "b": [0.6, 0.8, 0.0], "c": [0.0, 0.0, 3.0]}
+    for key, vec in vectors.items():
+        exact.put_vector(key, vec, key)
+        quantized.put_vector(key, vec, key)
+    query = [1.0, 0.5, 0.0]
+    expected = exact.similarity_search(query, top_k=3)
+    got = quantized.similarity_search(query, top_k=3)
+    assert [r[0] for r in got] == [r[0] for r in expected]
+    assert got[0][2] == pytest.approx(expected[0][2], abs=1e-2)
+    assert quantized.get("b").vector == [0.6, 0.8, 0.0]  # stored values untouched
+
+    with pytest.raises(ValueError):
+        LVector(dtype="bfloat16")
+
+
+def test_lvector_hnsw_without_backend_uses_exact_scan(monkeypatch):
+    from hippoium.core.memory import stores
+
+    monkeypatch.setattr(stores, "hnswlib", None)
+    lv = LVector(index_type="hnsw", ann_min_items=1)
+    lv.put_vector("a", [1.0, 0.0], "a")
+    lv.put_vector("b", [0.0, 1.0], "b")
+    assert [r[0] for r in lv.similarity_search([1.0, 0.1], top_k=1)] == ["a"]
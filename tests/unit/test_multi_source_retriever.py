@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import os
 
+import pytest
+
 from hippoium.core.retriever import (
     APISource,
     DatabaseSource,
@@ -41,7 +43,10 @@ DB_RECORDS = [
 ]
 
 
-def build_retriever():
+@pytest.fixture(scope="module")
+def retriever():
+    # Inputs are identical for every test, so index once per module.
+    # setup_module has already written FILE_PATH by the time this runs.
     local_source = LocalFileSource([FILE_PATH])
     api_source = APISource(dummy_api_fetch)
     db_source = DatabaseSource(DB_RECORDS)
@@ -53,16 +58,16 @@ def build_retriever():
         dedup_threshold=0.8,
     )
     r.index_all()
-    return r
+    yield r
+    r.close()
 
 
-def test_sources_loaded():
-    r = build_retriever()
-    assert len(r.sources) == 3
+def test_sources_loaded(retriever):
+    assert len(retriever.sources) == 3
 
 
-def test_basic_retrieval_and_filters():
-    r = build_retriever()
+def test_basic_retrieval_and_filters(retriever):
+    r = retriever
 
     # case A: dedup similar entries
     res_a = r.retrieve("Python programming")
@@ -79,9 +84,8 @@ def test_basic_retrieval_and_filters():
     assert res_c == []
 
 
-def test_insert_into_ragtree():
-    r = build_retriever()
-    docs = r.retrieve("Python programming")
+def test_insert_into_ragtree(retriever):
+    docs = retriever.retrieve("Python programming")
 
     class DummyRAGTree:
         def __init__(self):
@@ -96,3 +100,51 @@ def test_insert_into_ragtree():
 
     assert len(tree.nodes) == len(docs)
     assert tree.nodes[0]["source"].startswith("file:")
+
+
+def test_local_file_source_rereads_changed_file(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("first version", encoding="utf-8")
+    assert LocalFileSource([str(path)]).documents[0].content == "first version"
+
+    path.write_text("second, longer version", encoding="utf-8")
+    assert LocalFileSource([str(path)]).documents[0].content == "second, longer version"
+
+    LocalFileSource.clear_cache()
+    assert LocalFileSource(["not a file"]).documents[0].content == "not a file"
+
+
+def test_parallel_fan_out_keeps_source_order_and_releases_pool():
+    import gc
+
+    first = DatabaseSource(["python first", "shared python text"])
+    second = DatabaseSource(["python second"])
+    with MultiSourceRetriever(sources=[first, second], max_workers=2) as r:
+        docs = r.retrieve("python")
+        pool = r._pool
+        assert pool is not None  # more than one source: fan-out ran on the pool
+        assert [d.content for d in docs] == [
+            "python first",
+            "shared python text",
+            "python second",
+        ]
+    assert pool._shutdown and r._pool is None
+
+    r = MultiSourceRetriever(sources=[first, second], max_workers=2)
+    r.retrieve("python")
+    pool = r._pool
+    del r
+    gc.collect()
+    assert pool._shutdown  # collected without close(): finalizer shut it down
+
+
+def test_concurrent_retrieve_creates_one_pool_sized_to_sources():
+    from concurrent.futures import ThreadPoolExecutor as Executor
+
+    sources = [DatabaseSource(["python one"]), DatabaseSource(["python two"])]
+    with MultiSourceRetriever(sources=sources, max_workers=8) as r:
+        with Executor(max_workers=8) as callers:
+            list(callers.map(lambda _: r.retrieve("python"), range(32)))
+            pool = r._pool
+        assert pool._max_workers == 2
+        assert r._get_pool() is pool
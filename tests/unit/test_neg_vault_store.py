@@ -0,0 +1,26 @@
+from hippoium.core.negative.negative_engine import NegVaultStore
+from hippoium.ports.domain import Message
+
+
+def test_neg_vault_store_roundtrip(tmp_path):
+    store = NegVaultStore(tmp_path / "vault.jsonl")
+    assert store.load() == []
+
+    store.add(Message(role="assistant", content="拒絕回答", metadata={"status": "ERR"}))
+    store.add(Message(role="user", content="retry"))
+
+    loaded = store.load()
+    assert [m.content for m in loaded] == ["拒絕回答", "retry"]
+    assert loaded[0].metadata == {"status": "ERR"}
+    assert loaded[1].metadata == {}
+
+
+def test_neg_vault_store_matches_stdlib_json_output(tmp_path):
+    from datetime import datetime
+
+    store = NegVaultStore(tmp_path / "vault.jsonl")
+    when = datetime(2024, 1, 1)
+    store.add(Message(role="user", content="x", metadata={1: "a", "at": when}))
+
+    loaded = store.load()
+    assert loaded[0].metadata == {"1": "a", "at": str(when)}
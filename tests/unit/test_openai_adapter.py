@@ -18,7 +18,7 @@ class FakeEmbedding:
 
     def create(self, **kwargs):
         self.calls.append(kwargs)
-        return {"data": [{"embedding": [1.0, 2.0, 3.0]}]}
+        return {"data": [{"embedding": [1.0, 2.0, 3.0]} for _ in kwargs["input"]]}
 
 
 class FakeOpenAI:
@@ -42,6 +42,18 @@ def test_openai_adapter_uses_instance_key(monkeypatch):
     assert fake.Embedding.calls[-1]["api_key"] == "key-123"
 
 
+def test_openai_adapter_embeds_batch_in_one_call(monkeypatch):
+    fake = FakeOpenAI()
+    monkeypatch.setattr("hippoium.adapters.openai.openai", fake)
+
+    adapter = OpenAIAdapter(api_key="key-123")
+    vectors = adapter.embed(text for text in ("a", "b", "c"))
+
+    assert len(vectors) == 3
+    assert len(fake.Embedding.calls) == 1
+    assert fake.Embedding.calls[0]["input"] == ["a", "b", "c"]
+
+
 def test_openai_adapter_sequence_validation(monkeypatch):
     fake = FakeOpenAI()
     monkeypatch.setattr("hippoium.adapters.openai.openai", fake)
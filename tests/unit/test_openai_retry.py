@@ -67,33 +67,43 @@ class FakeOpenAI:
         self.Embedding = FakeEmbedding()
 
 
-def test_retry_on_rate_limit_then_success(monkeypatch):
-    fake = FakeOpenAI(FlakyChatCompletion())
-    monkeypatch.setattr("hippoium.adapters.openai.openai", fake)
+@pytest.fixture(autouse=True)
+def _no_sleep(monkeypatch):
     monkeypatch.setattr("hippoium.adapters.retry.time.sleep", lambda *_: None)
 
-    adapter = OpenAIAdapter(api_key="key-123", retry_config=RetryConfig(max_attempts=2, base_delay=0))
-    assert adapter.complete("hi") == "ok"
-    assert fake.ChatCompletion.calls == 2
 
+@pytest.fixture
+def make_adapter(monkeypatch):
+    """Patch in a FakeOpenAI around ``chat_completion`` and build an adapter."""
 
-def test_timeout_retries_then_raises(monkeypatch):
-    fake = FakeOpenAI(TimeoutChatCompletion())
-    monkeypatch.setattr("hippoium.adapters.openai.openai", fake)
-    monkeypatch.setattr("hippoium.adapters.retry.time.sleep", lambda *_: None)
+    def _make(chat_completion, max_attempts: int) -> OpenAIAdapter:
+        monkeypatch.setattr("hippoium.adapters.openai.openai", FakeOpenAI(chat_completion))
+        return OpenAIAdapter(
+            api_key="key-123",
+            retry_config=RetryConfig(max_attempts=max_attempts, base_delay=0),
+        )
+
+    return _make
 
-    adapter = OpenAIAdapter(api_key="key-123", retry_config=RetryConfig(max_attempts=2, base_delay=0))
+
+def test_retry_on_rate_limit_then_success(make_adapter):
+    completion = FlakyChatCompletion()
+    adapter = make_adapter(completion, max_attempts=2)
+    assert adapter.complete("hi") == "ok"
+    assert completion.calls == 2
+
+
+def test_timeout_retries_then_raises(make_adapter):
+    completion = TimeoutChatCompletion()
+    adapter = make_adapter(completion, max_attempts=2)
     with pytest.raises(TimeoutError):
         adapter.complete("hi")
-    assert fake.ChatCompletion.calls == 2
+    assert completion.calls == 2
 
 
-def test_bad_request_no_retry(monkeypatch):
-    fake = FakeOpenAI(BadRequestChatCompletion())
-    monkeypatch.setattr("hippoium.adapters.openai.openai", fake)
-    monkeypatch.setattr("hippoium.adapters.retry.time.sleep", lambda *_: None)
-
-    adapter = OpenAIAdapter(api_key="key-123", retry_config=RetryConfig(max_attempts=3, base_delay=0))
+def test_bad_request_no_retry(make_adapter):
+    completion = BadRequestChatCompletion()
+    adapter = make_adapter(completion, max_attempts=3)
     with pytest.raises(BadRequestError):
         adapter.complete("hi")
-    assert fake.ChatCompletion.calls == 1
+    assert completion.calls == 1
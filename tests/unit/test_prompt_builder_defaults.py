@@ -7,3 +7,21 @@ def test_prompt_builder_default_context_is_none():
     # defaults: template_id, context, user_query, negative_examples, tools, token_budget
     assert defaults[1] is None
     assert defaults[-1] is None
+
+
+def test_template_registry_render_matches_format_map():
+    builder = PromptBuilder()
+    registry = builder.registry
+    content = "System: {{literal}} {context}\nUser: {user_query}"
+    registry.register_template("plain", content)
+    values = {"context": "ctx", "user_query": "q"}
+    assert registry.render("plain", values) == content.format_map(values)
+
+    # format specs are not compiled but still render
+    registry.register_template("spec", "User: {user_query:>3}")
+    assert registry.render("spec", {"user_query": "q"}) == "User:   q"
+
+    # replacing the stored template picks up the new content
+    registry.templates["plain"].content = "User: {user_query}!"
+    assert registry.render("plain", values) == "User: q!"
+    assert registry.render("missing", values) is None
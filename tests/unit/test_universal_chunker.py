@@ -0,0 +1,29 @@
+import random
+
+from hippoium.core.retriever import universal_chunker as uc
+
+
+def test_recursive_parallel_split_matches_serial(monkeypatch):
+    rng = random.Random(0)
+    words = ["alpha", "beta.", "gamma", "delta。", "epsilon"]
+    paragraphs = [
+        " ".join(rng.choice(words) for _ in range(rng.randint(5, 120)))
+        for _ in range(40)
+    ]
+    text = "\n\n".join(paragraphs)
+
+    serial = list(uc.RecursiveChunker(uc.ChunkConfig(chunk_size=120, overlap=10)).split(text))
+    monkeypatch.setattr(uc, "_PARALLEL_MIN_CHARS", 0)
+    cfg = uc.ChunkConfig(chunk_size=120, overlap=10, workers=2)
+    assert list(uc.RecursiveChunker(cfg).split(text)) == serial
+
+
+def test_extract_blocks_keeps_nested_blocks():
+    blocks, cleaned = uc.extract_blocks("| a | ![img](x.png) |\n| b | c |")
+
+    assert blocks["__IMAGE_0__"] == ("image", "![img](x.png)")
+    btype, table = blocks["__TABLE_1__"]
+    assert btype == "table"
+    assert "__IMAGE_0__" in table
+    assert "__TABLE_1__" in cleaned
+    assert "![img]" not in cleaned